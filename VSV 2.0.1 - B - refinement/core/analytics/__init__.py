@@ -1,2 +1,2 @@
-# core/analytics/__init__.py
+# core/analytics/__init__.py
 # Exposes the sub-modules for easier importing
\ No newline at end of file
@@ -0,0 +1,113 @@
+import bisect
+import heapq
+import math
+import numpy as np
+
+# --- ORDER STATISTICS ---
+# Running "how many earlier scores were below this one" queries, used by the rank
+# enrichment and anything else that needs a percentile against a growing history.
+
+class SortedScores:
+    """
+    Sorted multiset of scores (blocked sorted list).
+    Values live in sorted blocks of ~BLOCK_SIZE; block maxes route lookups and a Fenwick
+    tree over block sizes gives the count of everything before a block. add() and rank()
+    are O(log n) searches plus a memmove inside one small block.
+    """
+    BLOCK_SIZE = 512
+
+    def __init__(self, values=()):
+        values = sorted(values)
+        size = self.BLOCK_SIZE
+        self._blocks = [values[i:i + size] for i in range(0, len(values), size)]
+        self._len = len(values)
+        self._build_index()
+
+    @classmethod
+    def from_sorted(cls, values):
+        """Skips the sort when values are already ascending"""
+        obj = cls.__new__(cls)
+        size = cls.BLOCK_SIZE
+        obj._blocks = [list(values[i:i + size]) for i in range(0, len(values), size)]
+        obj._len = len(values)
+        obj._build_index()
+        return obj
+
+    def _build_index(self):
+        self._maxes = [b[-1] for b in self._blocks]
+        n = len(self._blocks)
+        tree = [0] * (n + 1)
+        for i, block in enumerate(self._blocks, 1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent <= n: tree[parent] += tree[i]
+        self._tree = tree
+
+    def _count_before(self, k):
+        """Number of values in blocks[:k]"""
+        total = 0
+        while k:
+            total += self._tree[k]
+            k -= k & -k
+        return total
+
+    def add(self, value):
+        if not self._blocks:
+            self._blocks = [[value]]
+            self._len = 1
+            self._build_index()
+            return
+        # First block whose max >= value; past the end -> last block
+        k = min(bisect.bisect_left(self._maxes, value), len(self._blocks) - 1)
+        block = self._blocks[k]
+        bisect.insort(block, value)
+        self._maxes[k] = block[-1]
+        self._len += 1
+
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks[k:k + 1] = [block[:half], block[half:]]
+            self._build_index()
+        else:
+            i = k + 1
+            while i < len(self._tree):
+                self._tree[i] += 1
+                i += i & -i
+
+    def rank(self, value):
+        """Number of values strictly below value (bisect_left on the whole sorted list)"""
+        k = bisect.bisect_left(self._maxes, value)
+        if k == len(self._blocks): return self._len
+        return self._count_before(k) + bisect.bisect_left(self._blocks[k], value)
+
+    def percentile(self, value):
+        """Share of stored values strictly below value, in %. 100 when empty or a new max."""
+        if not self._len or value >= self._maxes[-1]: return 100
+        return (self.rank(value) / self._len) * 100
+
+    def max(self): return self._maxes[-1] if self._maxes else None
+
+    def __len__(self): return self._len
+
+    def __iter__(self):
+        for block in self._blocks: yield from block
+
+    def tolist(self): return [v for block in self._blocks for v in block]
+
+def running_quantile(values, q):
+    """
+    q-quantile (linear interpolation, as pandas/numpy) of values[:i+1] for every i.
+    Two heaps split the stream at the lower interpolation point: O(log n) per value.
+    """
+    out = np.empty(len(values))
+    lower, upper = [], [] # max-heap (negated) of the smallest lo+1 values, min-heap of the rest
+    for i, v in enumerate(values):
+        if lower and v > -lower[0]: heapq.heappush(upper, v)
+        else: heapq.heappush(lower, -v)
+        pos = q * i
+        lo = math.floor(pos)
+        while len(lower) > lo + 1: heapq.heappush(upper, -heapq.heappop(lower))
+        while len(lower) < lo + 1: heapq.heappush(lower, -heapq.heappop(upper))
+        below = -lower[0]
+        out[i] = below + (pos - lo) * (upper[0] - below) if pos > lo else below
+    return out
@@ -9,7 +9,39 @@ import pandas as pd
 MODIFIER_CACHE = {} 
 # --------------------
 
-def parse_kovaaks_stats_file(file_path):
+# Keys of the trailing summary block we actually need
+SUMMARY_KEYS = ('Scenario:', 'Score:', 'Horiz Sens:', 'Challenge Start:')
+TAIL_BLOCK_SIZE = 4096
+
+def read_summary_lines(file_path):
+    """
+    Reads the file backwards in blocks and returns only the summary lines we need.
+    Stops as soon as every key in SUMMARY_KEYS has been seen, so the per-kill rows
+    at the top of the file are never read on normal files.
+    """
+    found = {}
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        carry = b''
+        while pos > 0 and len(found) < len(SUMMARY_KEYS):
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + carry
+            parts = chunk.split(b'\n')
+            # The first part may be a partial line, finish it with the next block
+            carry = parts.pop(0) if pos > 0 else b''
+            # Walk bottom-up: first hit is the last occurrence, same as a full top-down scan
+            for raw in reversed(parts):
+                for key in SUMMARY_KEYS:
+                    if key not in found and raw.startswith(key.encode()):
+                        found[key] = raw.decode('utf-8')
+                        break
+                if len(found) == len(SUMMARY_KEYS): break
+    return list(found.values())
+
+def parse_kovaaks_stats_file(file_path, summary_only=False):
     try:
         filename = os.path.basename(file_path)
         timestamp_match = re.search(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})', filename)
@@ -19,8 +51,11 @@ def parse_kovaaks_stats_file(file_path):
         else:
             end_time = datetime.fromtimestamp(os.path.getmtime(file_path))
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        if summary_only:
+            lines = read_summary_lines(file_path)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
             
         data = {'Duration': 60.0} 
         start_time_str = None
@@ -100,5 +135,5 @@ def get_scenario_family_info(all_runs_df, base_scenario):
         MODIFIER_CACHE[scenario_name] = modifiers
         return modifiers
         
-    family_df['Modifiers'] = family_df['Scenario'].apply(parse_modifiers)
+    family_df['Modifiers'] = family_df['Scenario'].astype(object).apply(parse_modifiers)
     return family_df
\ No newline at end of file
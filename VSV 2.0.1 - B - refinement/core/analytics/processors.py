@@ -1,144 +1,521 @@
 import os
+import re
+import time
+import fnmatch
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import json
-import bisect
+import threading
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from core.analytics.parsers import parse_kovaaks_stats_file
+from core.analytics import storage
+from core.analytics.order_stats import SortedScores
+
+# Bulk ingestion only needs the summary block; partial() keeps it picklable for the pool
+_parse_summary = partial(parse_kovaaks_stats_file, summary_only=True)
 
 APP_DATA_DIR = Path.home() / '.kovaaks_stats_viewer'
 APP_DATA_DIR.mkdir(exist_ok=True) 
+CACHE_DIR = APP_DATA_DIR / 'history_cache'
+# Legacy pickle cache, only read once to migrate into CACHE_DIR
 CACHE_HISTORY_PATH = APP_DATA_DIR / 'kovaaks_history_cache.pkl'
 CACHE_INFO_PATH = APP_DATA_DIR / 'kovaaks_cache_info.json'
 
+# Parsed run fields persisted in the cache (SessionID etc. are derived on load)
+RUN_COLUMNS = ['Scenario', 'Sens', 'Score', 'Duration', 'Timestamp']
+DEDUP_KEYS = ['Scenario', 'Sens', 'Timestamp', 'Score']
+
+CHALLENGE_PATTERN = '*- Challenge -*.csv'
+# KovaaK's stamps sort lexically in time order: "2024.01.31-18.05.09"
+FILE_STAMP_RE = re.compile(r'(\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2})')
+
+# --- PARALLEL PARSING ---
+# Below this many files the pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 200
+PARALLEL_CHUNK_SIZE = 64
+
+def _resolve_worker_count(workers):
+    """0/None = auto (leave one core for the UI), otherwise the configured count"""
+    if workers and workers > 0: return int(workers)
+    return max(1, (os.cpu_count() or 1) - 1)
+
+def parse_stats_files(file_paths, workers=0):
+    """
+    Parses files into run dicts, preserving input order. Large batches go through a process pool.
+    Returns (runs, paths that failed to parse).
+    """
+    file_paths = [str(fp) for fp in file_paths]
+    n_workers = min(_resolve_worker_count(workers), len(file_paths))
+    
+    if n_workers <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+        results = [_parse_summary(fp) for fp in file_paths]
+    else:
+        # Small chunks keep every worker busy until the end, big ones cut IPC overhead
+        chunksize = max(1, min(PARALLEL_CHUNK_SIZE, len(file_paths) // (n_workers * 4)))
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                # map() yields in submission order, so the merge is stable
+                results = list(pool.map(_parse_summary, file_paths, chunksize=chunksize))
+        except Exception:
+            # Pool unavailable (frozen build, restricted env...) -> serial
+            results = [_parse_summary(fp) for fp in file_paths]
+    
+    return [d for d in results if d], [fp for fp, d in zip(file_paths, results) if not d]
+
+# --- SESSIONS ---
+# Gap_Before (seconds since the previous run) is stored per run, so a new session gap is
+# just a threshold + cumsum over it (see relabel_sessions), no reload.
+
+def _session_ids(gap_before, session_gap_minutes, first_id=0):
+    """SessionIDs for time sorted runs. The first row always opens session first_id."""
+    starts = gap_before > session_gap_minutes * 60
+    starts[:1] = False
+    return first_id + np.cumsum(starts)
+
+def _gap_seconds(timestamps):
+    return timestamps.diff().dt.total_seconds().to_numpy()
+
 def _detect_and_assign_sessions(history_df, session_gap_minutes=30):
     if history_df.empty or 'Timestamp' not in history_df.columns: return history_df
     df = history_df.copy()
-    df.sort_values('Timestamp', inplace=True)
-    time_diffs = df['Timestamp'].diff()
-    session_starts = time_diffs > pd.Timedelta(minutes=session_gap_minutes)
-    session_ids = session_starts.cumsum()
-    df['SessionID'] = session_ids
+    if not df['Timestamp'].is_monotonic_increasing: df.sort_values('Timestamp', kind='stable', inplace=True)
+    df['Gap_Before'] = _gap_seconds(df['Timestamp'])
+    df['SessionID'] = _session_ids(df['Gap_Before'].to_numpy(), session_gap_minutes)
     return df
 
-def find_and_process_stats(stats_folder_path, session_gap_minutes=30):
+def _extend_sessions(history_df, new_df, session_gap_minutes=30):
+    """
+    Adds new runs to a time sorted history that already has SessionIDs.
+    Only the session the earliest new run lands in (and everything after it) is re-labelled:
+    plain appends just extend/open sessions at the end, late files shift the later IDs.
+    Returns the combined run history, sorted by Timestamp.
+    """
+    cols = RUN_COLUMNS + ['Gap_Before', 'SessionID']
+    if not set(cols).issubset(history_df.columns) or not history_df['Timestamp'].is_monotonic_increasing:
+        return _detect_and_assign_sessions(pd.concat([history_df[RUN_COLUMNS], new_df], ignore_index=True), session_gap_minutes)
+    
+    new_df = new_df.sort_values('Timestamp', kind='stable')
+    session_ids = history_df['SessionID']
+    pos = history_df['Timestamp'].searchsorted(new_df['Timestamp'].iloc[0], side='right')
+    # Sessions before the one the new run joins can't change (IDs are sorted like the timestamps)
+    start = session_ids.searchsorted(session_ids.iat[pos - 1]) if pos > 0 else 0
+    first_id = session_ids.iat[start] if pos > 0 else 0
+    
+    tail = pd.concat([history_df.iloc[start:][RUN_COLUMNS], new_df], ignore_index=True)
+    tail.sort_values('Timestamp', kind='stable', inplace=True)
+    gaps = _gap_seconds(tail['Timestamp'])
+    if start > 0: gaps[0] = (tail['Timestamp'].iat[0] - history_df['Timestamp'].iat[start - 1]).total_seconds()
+    tail['Gap_Before'] = gaps
+    tail['SessionID'] = _session_ids(gaps, session_gap_minutes, first_id)
+    return pd.concat([history_df.iloc[:start][cols], tail], ignore_index=True)
+
+def relabel_sessions(df, session_gap_minutes):
+    """Re-groups a loaded (time sorted) history for a new session gap, in place. O(n) vectorized."""
+    if df is None or df.empty: return df
+    if 'Gap_Before' not in df.columns: df['Gap_Before'] = _gap_seconds(df['Timestamp'])
+    df['SessionID'] = _session_ids(df['Gap_Before'].to_numpy(), session_gap_minutes)
+    return df
+
+def find_and_process_stats(stats_folder_path, session_gap_minutes=30, workers=0):
     path_obj = Path(stats_folder_path)
     if not path_obj.is_dir(): return None
     
-    processed_files_info = {}
-    cached_history_df = pd.DataFrame()
-    
-    if os.path.exists(CACHE_HISTORY_PATH) and os.path.exists(CACHE_INFO_PATH):
-        try:
-            cached_history_df = pd.read_pickle(CACHE_HISTORY_PATH)
-            with open(CACHE_INFO_PATH, 'r') as f: processed_files_info = json.load(f)
-        except: pass
+    # No segmented cache yet (first run, legacy pickle, schema bump) -> rebuild it in one go
+    cached_history_df, processed_files_info, needs_reset = _load_cache()
+    scan_state = {} if needs_reset else storage.read_scan_state(CACHE_DIR)
             
-    all_challenge_files = list(path_obj.glob('*- Challenge -*.csv'))
-    new_files_to_process = []
-    current_files_info = {}
-    
-    for file_path in all_challenge_files:
-        try:
-            mtime = os.path.getmtime(file_path)
-            current_files_info[str(file_path)] = mtime
-            if str(file_path) not in processed_files_info or mtime > processed_files_info[str(file_path)]:
-                new_files_to_process.append(file_path)
-        except: continue
+    new_files_info, new_scan_state = scan_for_new_files(path_obj, processed_files_info, scan_state)
+    new_files_to_process = sorted(new_files_info)
 
+    combined_history_df = cached_history_df
+    new_rows_df = pd.DataFrame(columns=RUN_COLUMNS)
     if new_files_to_process:
-        newly_parsed_data = [d for d in (parse_kovaaks_stats_file(fp) for fp in new_files_to_process) if d]
+        newly_parsed_data, failed = parse_stats_files(new_files_to_process, workers)
+        _hold_back_pending(failed, new_files_info, new_scan_state)
         if newly_parsed_data:
-            new_df = pd.DataFrame(newly_parsed_data)
+            new_df = pd.DataFrame(newly_parsed_data)[RUN_COLUMNS]
             combined_history_df = pd.concat([cached_history_df, new_df], ignore_index=True)
-            combined_history_df.drop_duplicates(subset=['Scenario', 'Sens', 'Timestamp', 'Score'], inplace=True)
-        else: combined_history_df = cached_history_df
-    else: combined_history_df = cached_history_df
+            # Keep only genuinely new runs so segments never hold duplicates
+            is_dup = combined_history_df.duplicated(subset=DEDUP_KEYS).to_numpy()
+            new_rows_df = new_df[~is_dup[len(cached_history_df):]]
+            combined_history_df = combined_history_df[~is_dup]
         
     if combined_history_df.empty: return pd.DataFrame()
-    combined_history_df = _detect_and_assign_sessions(combined_history_df, session_gap_minutes)
 
     try:
-        combined_history_df.to_pickle(CACHE_HISTORY_PATH)
-        with open(CACHE_INFO_PATH, 'w') as f: json.dump(current_files_info, f, indent=2)
+        if needs_reset:
+            all_files_info = {**processed_files_info, **new_files_info}
+            storage.reset_history(CACHE_DIR, combined_history_df[RUN_COLUMNS].reset_index(drop=True), all_files_info, new_scan_state)
+        elif new_files_info:
+            # Append-only: the write is O(new rows), the full history is never rewritten here
+            n_segments = storage.append_segment(CACHE_DIR, new_rows_df.reset_index(drop=True), new_files_info, new_scan_state)
+            if storage.needs_compaction(n_segments): storage.compact_in_background(CACHE_DIR)
+        elif new_scan_state != scan_state:
+            storage.update_scan_state(CACHE_DIR, new_scan_state)
     except: pass
+
+    _KNOWN_FILES.clear()
+    _KNOWN_FILES.update(processed_files_info)
+    _KNOWN_FILES.update(new_files_info)
+
+    combined_history_df = _detect_and_assign_sessions(combined_history_df, session_gap_minutes)
     return combined_history_df.reset_index(drop=True)
 
-def enrich_history_with_stats(df):
-    """Calculates PBs and Assigns Ranks"""
-    if df is None or df.empty: return df
+# --- LIVE INGESTION ---
+# {path: mtime} of every file already in the history. Kept by find_and_process_stats so
+# watcher-driven ingests never have to re-read the segment manifests.
+_KNOWN_FILES = {}
+# A file that fails to parse this soon after its last write is most likely still being written
+PENDING_WRITE_SECONDS = 30
+
+def _hold_back_pending(failed_paths, new_files_info, scan_state):
+    """Keeps files still being written out of the manifest and forces a relist so the next scan retries them"""
+    now = time.time()
+    for fp in failed_paths:
+        if now - new_files_info[fp] < PENDING_WRITE_SECONDS:
+            del new_files_info[fp]
+            scan_state['dir_mtime'] = None
+
+def ingest_new_runs(stats_folder_path, history_df, session_gap_minutes=30):
+    """
+    Parses only the files that appeared since the last scan and appends their runs to history_df.
+    Returns the grown history (sessions assigned, not enriched) or None if there was nothing to add
+    or no full load has happened yet.
+    """
+    if history_df is None or history_df.empty or not _KNOWN_FILES: return None
+    scan_state = storage.read_scan_state(CACHE_DIR)
+    new_files_info, new_scan_state = scan_for_new_files(stats_folder_path, _KNOWN_FILES, scan_state)
+    
+    parsed, failed = [], []
+    for fp in sorted(new_files_info):
+        data = _parse_summary(fp)
+        if data: parsed.append(data)
+        else: failed.append(fp)
+    _hold_back_pending(failed, new_files_info, new_scan_state)
+    
+    new_rows_df = _drop_known_runs(history_df, pd.DataFrame(parsed)[RUN_COLUMNS] if parsed else pd.DataFrame(columns=RUN_COLUMNS))
+    try:
+        if new_files_info:
+            n_segments = storage.append_segment(CACHE_DIR, new_rows_df.reset_index(drop=True), new_files_info, new_scan_state)
+            if storage.needs_compaction(n_segments): storage.compact_in_background(CACHE_DIR)
+        elif new_scan_state != scan_state:
+            storage.update_scan_state(CACHE_DIR, new_scan_state)
+    except: pass
+    _KNOWN_FILES.update(new_files_info)
+    
+    if new_rows_df.empty: return None
+    return _extend_sessions(history_df, new_rows_df, session_gap_minutes).reset_index(drop=True)
+
+def _drop_known_runs(history_df, new_df):
+    """Rows of new_df not already in history_df. Only runs sharing a timestamp can be duplicates."""
+    if new_df.empty: return new_df
+    candidates = history_df.loc[history_df['Timestamp'].isin(new_df['Timestamp']), RUN_COLUMNS]
+    combined = pd.concat([candidates, new_df], ignore_index=True)
+    is_dup = combined.duplicated(subset=DEDUP_KEYS).to_numpy()
+    return new_df[~is_dup[len(candidates):]]
+
+def scan_for_new_files(stats_dir, files_info, scan_state):
+    """
+    Returns ({path: mtime} of files to ingest, updated scan state).
+    - Folder mtime unchanged since the last scan -> nothing new, no listing at all.
+    - Otherwise one os.scandir pass; files stamped at or before the newest known stamp
+      (the watermark) that are already in the manifest are skipped without a stat call.
+    """
+    stats_dir = str(stats_dir)
+    try: dir_mtime = os.stat(stats_dir).st_mtime_ns
+    except OSError: return {}, scan_state
     
-    df = df.sort_values('Timestamp').reset_index(drop=True)
+    same_dir = scan_state.get('dir') == stats_dir
+    if same_dir and scan_state.get('dir_mtime') == dir_mtime: return {}, scan_state
     
-    ranks = [("SINGULARITY", 100), ("ARCADIA", 95), ("UBER", 90), ("EXALTED", 82), ("BLESSED", 75), ("TRANSMUTE", 55)]
-    gated = {"SINGULARITY", "ARCADIA", "UBER"}
+    watermark = scan_state.get('watermark', '') if same_dir else ''
+    newest = watermark
+    prefix = os.path.join(stats_dir, '')
+    new_files = {}
     
-    for r, _ in ranks: df[f'Rank_{r}'] = 0
-    df['Is_PB'] = False      # Sens PB
-    df['Is_Scen_PB'] = False # Scenario PB (Any Sens)
-    df['Is_First'] = False 
+    with os.scandir(stats_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not fnmatch.fnmatch(name, CHALLENGE_PATTERN): continue
+            path = prefix + name
+            m = FILE_STAMP_RE.search(name)
+            stamp = m.group(1) if m else ''
+            if stamp > newest: newest = stamp
+            # KovaaK's never rewrites a finished run, so known old files need no stat
+            if stamp and stamp <= watermark and path in files_info: continue
+            try: mtime = entry.stat().st_mtime # cached by scandir on Windows
+            except OSError: continue
+            if path not in files_info or mtime > files_info[path]: new_files[path] = mtime
+    
+    return new_files, {'dir': stats_dir, 'dir_mtime': dir_mtime, 'watermark': newest}
 
-    updates = []
+def _load_cache():
+    """Returns (cached runs df, {path: mtime}, needs_reset) from the segment store, falling back to the old pickle"""
+    cached_df, files_info = storage.load_history(CACHE_DIR)
+    if cached_df is not None: return cached_df, files_info, False
     
-    # 1. PER SENSITIVITY PASS (Existing Logic)
-    for (scen, sens), group in df.groupby(['Scenario', 'Sens']):
-        history = []
-        indices = group.index
-        scores = group['Score'].values
+    if os.path.exists(CACHE_HISTORY_PATH) and os.path.exists(CACHE_INFO_PATH):
+        try:
+            cached_df = pd.read_pickle(CACHE_HISTORY_PATH)
+            with open(CACHE_INFO_PATH, 'r') as f: files_info = json.load(f)
+            return cached_df[RUN_COLUMNS], files_info, True
+        except: pass
+    return pd.DataFrame(), {}, True
+
+# --- ENRICHMENT ---
+# (name, percentile, gated) - gated tiers need RANK_GATE_RUNS runs on the combo.
+# Users can override both via the "rank_tiers" / "rank_gate_runs" settings.
+DEFAULT_RANK_TIERS = [("SINGULARITY", 100, True), ("ARCADIA", 95, True), ("UBER", 90, True),
+                      ("EXALTED", 82, False), ("BLESSED", 75, False), ("TRANSMUTE", 55, False)]
+RANK_GATE_RUNS = 10
+# Per-run columns the enrichment owns. Pct = percentile vs earlier runs of the same combo
+# (float32 is exact for integer tiers), Run_Num = 1-based run count on the combo.
+ENRICH_COLUMNS = {'Is_PB': np.int8, 'Is_Scen_PB': np.int8, 'Is_First': np.int8, 'Pct': np.float32, 'Run_Num': np.int32}
+ENRICH_STATE_NAME = 'enrich_state'
+ENRICH_STATE_VERSION = 3
+# Persisted loads only write the runs ranked since the last full state write (the tail);
+# the full state is rewritten once the tail outgrows this fraction of it
+ENRICH_TAIL_NAME = 'enrich_tail'
+ENRICH_TAIL_MAX_FRACTION = 0.1
+# On disk the three PB flags share one byte
+FLAG_BITS = {'Is_PB': 1, 'Is_Scen_PB': 2, 'Is_First': 4}
+
+def _empty_enrich_columns(n):
+    return {col: np.zeros(n, dtype=dtype) for col, dtype in ENRICH_COLUMNS.items()}
+
+class EnrichState:
+    """
+    Running state left behind by the last enrichment: every (Scenario, Sens) score history
+    (sorted), each scenario's max and the enriched columns of the rows it has seen. Runs
+    appended later in time only need ranking against this state.
+    """
+    def __init__(self):
+        self.rows = 0
+        self.last_ts = None
+        self.checksum = 0.0
+        self.combo_scores = {} # (Scenario, Sens) -> SortedScores, len() = run count
+        self.scen_max = {}
+        self.columns = _empty_enrich_columns(0)
+        # Rows / checksum of the full state on disk (None = nothing saved yet)
+        self.saved_rows = 0
+        self.saved_checksum = None
+
+    def covers(self, ts, scores):
+        """True if the first self.rows runs of the (time sorted) history are the ones we enriched"""
+        if self.rows == 0 or self.rows > len(ts): return False
+        if int(ts[self.rows - 1]) != self.last_ts: return False
+        return float(scores[:self.rows].sum()) == self.checksum
+
+    def seal(self, ts, scores, columns):
+        self.rows = len(ts)
+        self.last_ts = int(ts[-1]) if len(ts) else None
+        self.checksum = float(scores.sum())
+        self.columns = columns
+
+_ENRICH_STATE = None
+# The loader and live-ingest threads both enrich: one at a time, state grown and saved under the lock
+_ENRICH_LOCK = threading.Lock()
+
+def _rank_runs(state, scen_vals, sens_vals, scores, cols, start):
+    """
+    Fills cols for the runs from row start on, in time order, growing the state as it goes.
+    scen_vals / sens_vals / scores hold only those runs. O(log n) per run (see SortedScores).
+    """
+    is_pb, is_scen_pb, is_first = cols['Is_PB'], cols['Is_Scen_PB'], cols['Is_First']
+    pct, run_num = cols['Pct'], cols['Run_Num']
+    for j, score in enumerate(scores):
+        i = start + j
+        key = (scen_vals[j], sens_vals[j])
+        history = state.combo_scores.get(key)
+        if history is None: history = state.combo_scores[key] = SortedScores()
         
-        for i, score in enumerate(scores):
-            idx = indices[i]
-            run_count = i + 1
-            
-            is_pb = False
-            is_first = False
-            
-            if not history: 
-                is_first = True
-                is_pb = True 
-            elif score > history[-1]: 
-                is_pb = True
-            
-            if is_pb: updates.append((idx, 'Is_PB', True))
-            if is_first: updates.append((idx, 'Is_First', True))
-            
-            # Rank Logic (Same as before)
-            if not history: percentile = 100
-            elif score >= history[-1]: percentile = 100
-            else:
-                pos = bisect.bisect_left(history, score)
-                percentile = (pos / len(history)) * 100
-            bisect.insort(history, score)
-            
-            for r_name, r_val in ranks:
-                if r_name in gated and run_count < 10: continue
-                if percentile >= r_val: updates.append((idx, f'Rank_{r_name}', 1))
-
-    # 2. PER SCENARIO PASS (New Logic)
-    # Group only by Scenario Name to find global maxes
-    for scen, group in df.groupby('Scenario'):
-        history = []
-        indices = group.index
-        scores = group['Score'].values
+        if not history:
+            is_first[i] = 1
+            is_pb[i] = 1
+        elif score > history.max():
+            is_pb[i] = 1
         
-        for i, score in enumerate(scores):
-            # If it's the first run ever, it's a PB, but we might filter 'Firsts' later
-            # Logic: If Score > Max(History), it's a Scen PB
-            if not history:
-                updates.append((indices[i], 'Is_Scen_PB', True))
-                history.append(score) # Optimization: Only keep max?
-                # Actually bisect is cheap. Let's keep history sorted.
-            else:
-                current_max = history[-1]
-                if score > current_max:
-                    updates.append((indices[i], 'Is_Scen_PB', True))
-                
-                bisect.insort(history, score)
-
-    # Apply
-    for col in ['Is_PB', 'Is_Scen_PB', 'Is_First'] + [f'Rank_{r[0]}' for r in ranks]:
-        df[col] = df[col].astype(int) 
+        pct[i] = history.percentile(score)
+        run_num[i] = len(history) + 1
+        history.add(score)
         
-    for idx, col, val in updates:
-        df.at[idx, col] = val
+        # Scenario PB (any Sens)
+        scen_max = state.scen_max.get(key[0])
+        if scen_max is None or score > scen_max:
+            is_scen_pb[i] = 1
+            state.scen_max[key[0]] = score
+
+def _rank_all(df, scores):
+    """
+    Full pass, vectorized. Returns (cols, state) identical to _rank_runs from an empty state:
+    PBs from a shifted grouped cummax, firsts from cumcount, percentiles from an expanding
+    min-rank (rank - 1 = prior scores strictly below, i.e. bisect_left).
+    """
+    state = EnrichState()
+    cols = _empty_enrich_columns(len(df))
+    combo, combo_keys = pd.MultiIndex.from_arrays([df['Scenario'], df['Sens']]).factorize()
+    score_s = pd.Series(scores)
+    by_combo = score_s.groupby(combo, sort=False)
+    
+    n_prior = by_combo.cumcount().to_numpy()
+    prev_max = by_combo.cummax().groupby(combo, sort=False).shift().to_numpy()
+    first = n_prior == 0
+    cols['Is_First'][:] = first
+    cols['Is_PB'][:] = first | (scores > prev_max)
+    
+    count_less = by_combo.expanding().rank(method='min').droplevel(0).sort_index().to_numpy() - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cols['Pct'][:] = np.where(first | (scores >= prev_max), 100.0, (count_less / n_prior) * 100)
+    cols['Run_Num'][:] = n_prior + 1
+    
+    scen, scen_names = pd.factorize(df['Scenario'])
+    by_scen = score_s.groupby(scen, sort=False)
+    prev_scen_max = by_scen.cummax().groupby(scen, sort=False).shift().to_numpy()
+    cols['Is_Scen_PB'][:] = (by_scen.cumcount().to_numpy() == 0) | (scores > prev_scen_max)
+    
+    # Leave the same running state the per-run path would have built
+    order = np.lexsort((scores, combo))
+    bounds = np.searchsorted(combo[order], np.arange(len(combo_keys) + 1))
+    sorted_scores = scores[order].tolist()
+    for key, a, b in zip(combo_keys, bounds[:-1], bounds[1:]):
+        state.combo_scores[key] = SortedScores.from_sorted(sorted_scores[a:b])
+    state.scen_max = dict(zip(scen_names, by_scen.max().sort_index().tolist()))
+    return cols, state
+
+def _load_enrich_state():
+    arrays, meta = storage.load_arrays(CACHE_DIR, ENRICH_STATE_NAME)
+    if arrays is None or meta.get('version') != ENRICH_STATE_VERSION: return None
+    state = EnrichState()
+    state.rows, state.last_ts, state.checksum = meta['rows'], meta['last_ts'], meta['checksum']
+    state.columns = {col: np.array(arrays[col], dtype=ENRICH_COLUMNS[col]) for col in ['Pct', 'Run_Num']}
+    state.columns.update(_decode_flags(arrays['flags']))
+    offsets = np.cumsum([0] + meta['counts'])
+    all_scores = arrays['scores'].tolist()
+    for (scen, sens), a, b in zip(meta['combos'], offsets[:-1], offsets[1:]):
+        state.combo_scores[(scen, sens)] = SortedScores.from_sorted(all_scores[a:b])
+        if b > a and (scen not in state.scen_max or all_scores[b - 1] > state.scen_max[scen]):
+            state.scen_max[scen] = all_scores[b - 1]
+    state.saved_rows, state.saved_checksum = state.rows, state.checksum
+    
+    tail, tail_meta = storage.load_arrays(CACHE_DIR, ENRICH_TAIL_NAME)
+    if tail is not None and tail_meta.get('version') == ENRICH_STATE_VERSION and \
+            (tail_meta['base_rows'], tail_meta['base_checksum']) == (state.rows, state.checksum):
+        _apply_enrich_tail(state, tail, tail_meta)
+    return state
+
+def _decode_flags(flags):
+    return {col: ((flags & bit) != 0).astype(np.int8) for col, bit in FLAG_BITS.items()}
+
+def _encode_flags(columns, a=0):
+    flags = np.zeros(len(columns['Pct']) - a, dtype=np.uint8)
+    for col, bit in FLAG_BITS.items(): flags |= columns[col][a:].astype(np.uint8) * np.uint8(bit)
+    return flags
+
+def _apply_enrich_tail(state, arrays, meta):
+    """Replays the runs saved after the full state: scores into their combos, columns appended"""
+    names = meta['scenarios']
+    for code, sens, score in zip(arrays['scen'].tolist(), arrays['sens'].tolist(), arrays['scores'].tolist()):
+        scen = names[code]
+        history = state.combo_scores.get((scen, sens))
+        if history is None: history = state.combo_scores[(scen, sens)] = SortedScores()
+        history.add(score)
+        if scen not in state.scen_max or score > state.scen_max[scen]: state.scen_max[scen] = score
+    tail_cols = _decode_flags(arrays['flags'])
+    tail_cols['Pct'], tail_cols['Run_Num'] = arrays['Pct'], arrays['Run_Num']
+    state.columns = {col: np.concatenate([state.columns[col], np.asarray(tail_cols[col], dtype=dtype)])
+                     for col, dtype in ENRICH_COLUMNS.items()}
+    state.rows, state.last_ts, state.checksum = meta['rows'], meta['last_ts'], meta['checksum']
+
+def _save_enrich_state(state, df):
+    """Writes the runs ranked since the last full write; the full state only once that tail is large"""
+    a = state.saved_rows
+    if state.saved_checksum is None or state.rows - a > ENRICH_TAIL_MAX_FRACTION * a:
+        _save_full_enrich_state(state)
+        state.saved_rows, state.saved_checksum = state.rows, state.checksum
+        return
+    codes, names = pd.factorize(df['Scenario'].iloc[a:state.rows])
+    arrays = {'flags': _encode_flags(state.columns, a), 'Pct': state.columns['Pct'][a:], 'Run_Num': state.columns['Run_Num'][a:],
+              'scen': codes.astype(np.int32), 'sens': df['Sens'].to_numpy(dtype=np.float64)[a:state.rows],
+              'scores': df['Score'].to_numpy(dtype=np.float64)[a:state.rows]}
+    meta = {'version': ENRICH_STATE_VERSION, 'base_rows': a, 'base_checksum': state.saved_checksum,
+            'rows': state.rows, 'last_ts': state.last_ts, 'checksum': state.checksum, 'scenarios': [str(n) for n in names]}
+    storage.save_arrays(CACHE_DIR, ENRICH_TAIL_NAME, arrays, meta)
+
+def _save_full_enrich_state(state):
+    combos = list(state.combo_scores)
+    counts = [len(state.combo_scores[k]) for k in combos]
+    scores = np.fromiter((s for k in combos for s in state.combo_scores[k]), dtype=np.float64, count=sum(counts))
+    meta = {'version': ENRICH_STATE_VERSION, 'rows': state.rows, 'last_ts': state.last_ts, 'checksum': state.checksum,
+            'combos': [[scen, float(sens)] for scen, sens in combos], 'counts': counts}
+    arrays = {'flags': _encode_flags(state.columns), 'Pct': state.columns['Pct'], 'Run_Num': state.columns['Run_Num'], 'scores': scores}
+    storage.save_arrays(CACHE_DIR, ENRICH_STATE_NAME, arrays, meta)
+
+def apply_rank_tiers(df, rank_tiers=None, gate_runs=None):
+    """
+    (Re)derives the Rank_* columns from Pct / Run_Num, in place. Vectorized, so changing
+    tiers or gating never needs a re-enrich.
+    """
+    if df is None or df.empty or 'Pct' not in df.columns: return df
+    rank_tiers = rank_tiers or DEFAULT_RANK_TIERS
+    gate_runs = RANK_GATE_RUNS if gate_runs is None else gate_runs
+    
+    df.drop(columns=[c for c in df.columns if c.startswith('Rank_')], inplace=True)
+    pct = df['Pct'].to_numpy()
+    gate_ok = df['Run_Num'].to_numpy() >= gate_runs
+    for name, threshold, gated in rank_tiers:
+        hit = pct >= threshold
+        if gated: hit &= gate_ok
+        df[f'Rank_{name}'] = hit.astype(np.int8)
+    return df
+
+def enrich_history_with_stats(df, persist=False, rank_tiers=None, gate_runs=None):
+    """
+    Calculates PBs, percentiles and Assigns Ranks.
+    Runs already seen by the last call keep their cached columns; only runs appended after
+    them are ranked. Anything else (late files, another folder) triggers a full pass.
+    persist: also write the state to the cache dir so the next start-up can reuse it.
+    """
+    global _ENRICH_STATE
+    if df is None or df.empty: return df
+    
+    df = df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+    ts = df['Timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+    scores = df['Score'].to_numpy(dtype=np.float64)
+    
+    with _ENRICH_LOCK:
+        state = _ENRICH_STATE
+        if state is None:
+            try: state = _load_enrich_state()
+            except: state = None
+        if state is not None and state.covers(ts, scores):
+            start = state.rows
+            cols = _empty_enrich_columns(len(df))
+            for col, arr in cols.items(): arr[:start] = state.columns[col]
+            # Only the appended rows go through Python lists
+            _rank_runs(state, df['Scenario'].iloc[start:].tolist(), df['Sens'].iloc[start:].tolist(), scores[start:].tolist(), cols, start)
+        else:
+            start = 0
+            cols, state = _rank_all(df, scores)
+        state.seal(ts, scores, cols)
+        _ENRICH_STATE = state
         
-    return df
\ No newline at end of file
+        if persist and start < len(df):
+            try: _save_enrich_state(state, df)
+            except: pass
+    
+    # Copies: the state keeps its own arrays for the next incremental pass
+    for col in ENRICH_COLUMNS: df[col] = cols[col].copy()
+    return apply_rank_tiers(_compact_dtypes(df), rank_tiers, gate_runs)
+
+def _compact_dtypes(df):
+    """
+    In-memory schema: Scenario dictionary-encoded (category), flags int8, gaps float32.
+    Score stays float64 (exact PB comparisons), Sens stays float (display + variant lookups).
+    Group by 'Scenario' with observed=True so filtered frames don't list every category.
+    """
+    if isinstance(df['Scenario'].dtype, pd.CategoricalDtype): df['Scenario'] = df['Scenario'].cat.remove_unused_categories()
+    else: df['Scenario'] = df['Scenario'].astype('category')
+    if 'Gap_Before' in df.columns: df['Gap_Before'] = df['Gap_Before'].astype(np.float32)
+    return df
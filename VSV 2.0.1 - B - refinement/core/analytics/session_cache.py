@@ -0,0 +1,92 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from core.analytics import stats
+from core.analytics.processors import APP_DATA_DIR
+
+# --- SESSION SUMMARY CACHE ---
+# analyze_session output, kept per (stack mode, session fingerprint) and pickled next to the
+# history cache. The fingerprint is what a summary depends on: the session's own runs and
+# how many runs came before it. Appending new runs leaves older sessions valid; gap changes
+# only relabel ids, so regrouped sessions that keep their runs still hit.
+SUMMARY_CACHE_PATH = APP_DATA_DIR / 'session_summaries.pkl'
+SUMMARY_CACHE_VERSION = 2
+MAX_SUMMARIES = 500
+# Most recent sessions precomputed after a load
+WARM_SESSIONS = 30
+
+class SessionSummaryCache:
+    def __init__(self, path=SUMMARY_CACHE_PATH):
+        self.path = path
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def key(session_df, history, stack_pbs):
+        start = session_df['Timestamp'].min()
+        return (bool(stack_pbs), start.value, len(session_df), history.count_before(start), round(float(session_df['Score'].sum()), 4))
+
+    def get(self, key):
+        with self._lock:
+            summary = self._items.get(key)
+            if summary is not None: self._items.move_to_end(key)
+            return summary
+
+    def put(self, key, summary):
+        with self._lock:
+            # Same (stack, start) = same session grown by new runs: the old fingerprint is dead
+            for stale in [k for k in self._items if k[:2] == key[:2] and k != key]: del self._items[stale]
+            self._items[key] = summary
+            self._items.move_to_end(key)
+            while len(self._items) > MAX_SUMMARIES: self._items.popitem(last=False)
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._dirty = bool(self._items)
+            self._items.clear()
+
+    def summarize(self, session_df, history, stack_pbs):
+        """Cached analyze_session; history is the HistoryStore the session was taken from"""
+        if session_df.empty: return None
+        key = self.key(session_df, history, stack_pbs)
+        summary = self.get(key)
+        if summary is None:
+            summary = stats.analyze_session(session_df, history.df, stack_pbs=stack_pbs, history=history)
+            if summary: self.put(key, summary)
+        return summary
+
+    def range_report(self, history, start, end, stack_pbs):
+        """Report over every session with runs in [start, end), merged from per-session summaries"""
+        runs = history.between(start, end)
+        if runs.empty: return None
+        summaries = [self.summarize(history.session(sid).copy(), history, stack_pbs) for sid in runs['SessionID'].unique()]
+        return stats.analyze_range(summaries, history, stack_pbs)
+
+    def warm(self, history, stack_pbs, limit=WARM_SESSIONS, should_stop=None):
+        """Precomputes the most recent sessions. should_stop() is polled between sessions."""
+        if history.empty or 'SessionID' not in history.df.columns: return
+        for session_id in history.df['SessionID'].unique()[::-1][:limit]:
+            if should_stop and should_stop(): return
+            self.summarize(history.session(session_id).copy(), history, stack_pbs)
+
+    # --- PERSISTENCE ---
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f: data = pickle.load(f)
+            if data.get('version') == SUMMARY_CACHE_VERSION: self._items = OrderedDict(data['items'])
+        except: pass
+
+    def save(self):
+        with self._lock:
+            if not self._dirty: return
+            data = {'version': SUMMARY_CACHE_VERSION, 'items': list(self._items.items())}
+            self._dirty = False
+        tmp_path = str(self.path) + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except: pass
@@ -1,6 +1,6 @@
+import numpy as np
 import pandas as pd
 from datetime import timedelta
-from collections import defaultdict
 
 def format_timedelta(td):
     if isinstance(td, (int, float)): td = timedelta(seconds=td)
@@ -35,13 +35,14 @@ def calculate_detailed_stats(runs_df):
     stats['launchpad_avg'] = pre_pb['Score'].mean() if not pre_pb.empty else 0.0
     return stats
 
-def calculate_profile_stats(df):
+def calculate_profile_stats(df, combo_stats=None):
+    """combo_stats: shared per-combo aggregates (HistoryStore.combo_stats), saves a groupby"""
     if df is None or df.empty: return {}
     stats = {
         'total_runs': len(df),
         'active_time': df['Duration'].sum(),
         'unique_scens': df['Scenario'].nunique(),
-        'unique_combos': df.groupby(['Scenario', 'Sens']).ngroups,
+        'unique_combos': len(combo_stats) if combo_stats is not None else df.groupby(['Scenario', 'Sens'], observed=True).ngroups,
         'total_pbs': df['Is_PB'].sum()
     }
     ranks = {}
@@ -49,132 +50,89 @@ def calculate_profile_stats(df):
         if col.startswith('Rank_'):
             ranks[col.replace('Rank_', '')] = df[col].sum()
     stats['ranks'] = ranks
-    stats['top_scens'] = df['Scenario'].value_counts().head(10).to_dict()
+    stats['top_scens'] = df['Scenario'].value_counts()[lambda c: c > 0].head(10).to_dict()
     return stats
 
-def analyze_session(session_df, history_df, flow_window=5, stack_pbs=False):
+def analyze_session(session_df, history_df, flow_window=5, stack_pbs=False, history=None):
+    """history: optional HistoryStore, answers the prior-history baselines by index lookups"""
     if session_df.empty: return None
     session_start = session_df['Timestamp'].min()
-    prior_history = history_df[history_df['Timestamp'] < session_start]
 
-    base_grid_avg = prior_history.groupby(['Scenario', 'Sens'])['Score'].mean().to_dict() if not prior_history.empty else {}
-    base_scen_avg = prior_history.groupby('Scenario')['Score'].mean().to_dict() if not prior_history.empty else {}
-    
-    base_grid_max = prior_history.groupby(['Scenario', 'Sens'])['Score'].max().to_dict() if not prior_history.empty else {}
-    base_scen_max = prior_history.groupby('Scenario')['Score'].max().to_dict() if not prior_history.empty else {}
+    if history is not None:
+        combos = set(session_df.groupby(['Scenario', 'Sens'], observed=True).indices)
+        base_grid_avg, base_scen_avg, base_grid_max, base_scen_max = history.prior_baselines(session_start, combos)
+    else:
+        prior_history = history_df[history_df['Timestamp'] < session_start]
 
-    def calc_graph(key_func, baselines):
-        data, hist = [], []
-        prev_pulse = 0.0
-        accs = defaultdict(lambda: {'sum':0.0, 'count':0})
+        base_grid_avg = prior_history.groupby(['Scenario', 'Sens'], observed=True)['Score'].mean().to_dict() if not prior_history.empty else {}
+        base_scen_avg = prior_history.groupby('Scenario', observed=True)['Score'].mean().to_dict() if not prior_history.empty else {}
         
-        for i, row in enumerate(session_df.sort_values('Timestamp').itertuples()):
-            key = key_func(row)
-            base = baselines.get(key, 0)
-            acc = accs[key]
-            acc['sum']+=row.Score; acc['count']+=1
-            curr_avg = acc['sum']/acc['count']
-            eff_base = base if base > 0 else curr_avg
-            
-            score_pct = ((row.Score - eff_base)/eff_base)*100 if eff_base>0 else 0
-            trend_pct = ((curr_avg - eff_base)/eff_base)*100 if eff_base>0 else 0
-            hist.append(score_pct)
-            flow_pct = sum(hist[-flow_window:])/len(hist[-flow_window:])
-            pulse_pct = score_pct if i==0 else (score_pct*0.5)+(prev_pulse*0.5)
-            prev_pulse = pulse_pct
-            
-            data.append({
-                'time': int(row.Timestamp.timestamp()), 'pct': score_pct,
-                'trend_pct': trend_pct, 'flow_pct': flow_pct, 'pulse_pct': pulse_pct,
-                'scenario': row.Scenario, 'sens': row.Sens
-            })
-        return data
+        base_grid_max = prior_history.groupby(['Scenario', 'Sens'], observed=True)['Score'].max().to_dict() if not prior_history.empty else {}
+        base_scen_max = prior_history.groupby('Scenario', observed=True)['Score'].max().to_dict() if not prior_history.empty else {}
 
-    def calc_lists(grouper, base_max):
-        pbs, played = [], []
-        
-        # Helper to extract key from row
-        def get_key(row):
-            if isinstance(grouper, list): return tuple(getattr(row, k) for k in grouper)
-            return getattr(row, grouper)
+    # --- VECTORIZED PIPELINE ---
+    # Runs in time order; each view (grid / scenario) groups them once and derives its graph and lists from that
+    runs = session_df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+    scores = runs['Score'].to_numpy(dtype=float)
+    stamps = runs['Timestamp']
+    times = stamps.to_numpy('datetime64[s]').astype(np.int64).tolist()
+    scen_names = runs['Scenario'].astype(object).tolist()
+    sens_vals = runs['Sens'].tolist()
 
-        # 1. PLAYED LIST
-        # Sort groups by time of first occurrence to act as default if needed, 
-        # though we will inject explicit time.
-        for key, g in session_df.groupby(grouper):
-            pb = g['Score'].max()
-            first_ts = g['Timestamp'].min() # <--- NEW: Capture Time
-            
-            name = key[0] if isinstance(key, tuple) else key
-            sens = key[1] if isinstance(key, tuple) else None
-            
-            prev = base_max.get(key)
-            is_pb = False
-            if prev and pb > prev: is_pb = True
-            
-            played.append({
-                'name': name, 'sens': sens, 'count': len(g), 
-                'best': pb, 'avg': g['Score'].mean(), 'is_pb': is_pb,
-                'time': first_ts # <--- Store it
-            })
+    def calc_graph(keys, codes, baselines):
+        base = np.array([baselines.get(k, 0) for k in keys], dtype=float)[codes]
+        # Trend: running session average of the run's own key
+        curr_avg = (pd.Series(scores).groupby(codes).cumsum() / (pd.Series(codes).groupby(codes).cumcount() + 1)).to_numpy()
+        eff_base = np.where(base > 0, base, curr_avg)
+        safe_base = np.where(eff_base > 0, eff_base, 1)
+        score_pct = np.where(eff_base > 0, (scores - eff_base) / safe_base * 100, 0.0)
+        trend_pct = np.where(eff_base > 0, (curr_avg - eff_base) / safe_base * 100, 0.0)
+        # Flow: trailing mean of the last flow_window runs
+        csum = np.concatenate([[0.0], np.cumsum(score_pct)])
+        idx = np.arange(1, len(score_pct) + 1)
+        flow_pct = (csum[idx] - csum[np.maximum(idx - flow_window, 0)]) / np.minimum(idx, flow_window)
+        # Pulse: p[i] = (s[i] + p[i-1]) / 2, p[0] = s[0]
+        pulse_pct = pd.Series(score_pct).ewm(alpha=0.5, adjust=False).mean().to_numpy()
+        return [{'time': t, 'pct': p, 'trend_pct': tr, 'flow_pct': f, 'pulse_pct': pu, 'scenario': sc, 'sens': se}
+                for t, p, tr, f, pu, sc, se in zip(times, score_pct.tolist(), trend_pct.tolist(), flow_pct.tolist(),
+                                                   pulse_pct.tolist(), scen_names, sens_vals)]
+
+    def calc_lists(keys, codes, base_max, base_avg):
+        # One pass per aggregate over the group codes
+        counts = np.bincount(codes, minlength=len(keys))
+        avgs = np.bincount(codes, weights=scores, minlength=len(keys)) / counts
+        bests = np.full(len(keys), -np.inf)
+        np.maximum.at(bests, codes, scores)
+        _, first_rows = np.unique(codes, return_index=True)
+        base_best = [base_max.get(k) for k in keys]
+        first_times = [stamps.iat[r] for r in first_rows]
+        pbs, avgs_list, played = _summary_lists(keys, counts, bests, avgs, first_times, base_max, base_avg, not stack_pbs)
 
-        # 2. PB LIST
-        if not stack_pbs:
-            for key, g in session_df.groupby(grouper):
-                pb = g['Score'].max()
-                prev = base_max.get(key)
-                if prev and pb > prev:
-                    name = key[0] if isinstance(key, tuple) else key
-                    sens = key[1] if isinstance(key, tuple) else None
-                    first_ts = g['Timestamp'].min() # <--- NEW
-                    
-                    pbs.append({
-                        'name': name, 'sens': sens, 'score': pb, 
-                        'prev': prev, 'imp': pb-prev, 'imp_pct': ((pb-prev)/prev)*100,
-                        'time': first_ts # <--- Store it
-                    })
-        else:
-            current_maxes = base_max.copy()
-            for row in session_df.sort_values('Timestamp').itertuples():
-                key = get_key(row)
-                prev = current_maxes.get(key)
-                if prev and row.Score > prev:
-                    name = key[0] if isinstance(key, tuple) else key
-                    sens = key[1] if isinstance(key, tuple) else None
-                    
-                    pbs.append({
-                        'name': name, 'sens': sens, 'score': row.Score, 
-                        'prev': prev, 'imp': row.Score-prev, 'imp_pct': ((row.Score-prev)/prev)*100,
-                        'time': row.Timestamp # <--- Exact time of the run
-                    })
-                    current_maxes[key] = row.Score
-
-        # Calculate Averages List
-        avgs_list = []
-        for key, g in session_df.groupby(grouper):
-            name = key[0] if isinstance(key, tuple) else key
-            sens = key[1] if isinstance(key, tuple) else None
-            first_ts = g['Timestamp'].min() # <--- NEW
-            
-            sess_avg = g['Score'].mean()
-            all_avg = base_grid_avg.get(key, sess_avg) if isinstance(key, tuple) else base_scen_avg.get(key, sess_avg)
-            
-            if all_avg > 0:
-                diff_pct = ((sess_avg - all_avg) / all_avg) * 100
-                avgs_list.append({
-                    'name': name, 'sens': sens, 
-                    'sess_avg': sess_avg, 'all_avg': all_avg, 
-                    'diff_pct': diff_pct,
-                    'time': first_ts # <--- Store it
+        if stack_pbs:
+            # Every run that beat the best so far (prior history + earlier runs this session).
+            # Keys without a prior best never count, as before.
+            prior = np.array([p if p else np.nan for p in base_best], dtype=float)[codes]
+            session_best = pd.Series(scores).groupby(codes).cummax().groupby(codes).shift(1).to_numpy()
+            prev = np.fmax(prior, session_best)
+            for i in np.flatnonzero(~np.isnan(prior) & (scores > prev)):
+                key = keys[codes[i]]
+                name, sens = key if isinstance(key, tuple) else (key, None)
+                pbs.append({
+                    'name': name, 'sens': sens, 'score': scores[i],
+                    'prev': prev[i], 'imp': scores[i]-prev[i], 'imp_pct': ((scores[i]-prev[i])/prev[i])*100,
+                    'time': stamps.iat[i]
                 })
 
         return pbs, avgs_list, played
 
-    g_graph = calc_graph(lambda r: (r.Scenario, r.Sens), base_grid_avg)
-    s_graph = calc_graph(lambda r: r.Scenario, base_scen_avg)
-    
-    pbs_g, avgs_g, played_g = calc_lists(['Scenario', 'Sens'], base_grid_max)
-    pbs_s, avgs_s, played_s = calc_lists('Scenario', base_scen_max)
+    def summarize(grouper, base_avg, base_max):
+        g = runs.groupby(grouper, observed=True)
+        # Group keys in groupby order, codes map each run to its key
+        keys, codes = list(g.size().index), g.ngroup().to_numpy()
+        return calc_graph(keys, codes, base_avg), calc_lists(keys, codes, base_max, base_avg), (keys, codes)
+
+    g_graph, (pbs_g, avgs_g, played_g), (combo_keys, combo_codes) = summarize(['Scenario', 'Sens'], base_grid_avg, base_grid_max)
+    s_graph, (pbs_s, avgs_s, played_s), _ = summarize('Scenario', base_scen_avg, base_scen_max)
 
     return {
         "meta": {
@@ -184,5 +142,109 @@ def analyze_session(session_df, history_df, flow_window=5, stack_pbs=False):
             "play_count": len(session_df)
         },
         "grid": {"graph_data": g_graph, "lists": {"pbs": pbs_g, "played": played_g, "avgs": avgs_g}, "pb_count": len(pbs_g)},
-        "scenario": {"graph_data": s_graph, "lists": {"pbs": pbs_s, "played": played_s, "avgs": avgs_s}, "pb_count": len(pbs_s)}
+        "scenario": {"graph_data": s_graph, "lists": {"pbs": pbs_s, "played": played_s, "avgs": avgs_s}, "pb_count": len(pbs_s)},
+        "totals": _combo_totals(combo_keys, combo_codes, scores, stamps, runs['Duration'].to_numpy(dtype=float))
+    }
+
+# --- MERGEABLE SUMMARIES ---
+# Per (scenario, sens): (count, score sum, max, first time, last time, active seconds).
+# merge_combo_totals is associative, so any range of sessions is a fold over their totals.
+
+def _combo_totals(keys, codes, scores, stamps, durations):
+    counts = np.bincount(codes, minlength=len(keys))
+    sums = np.bincount(codes, weights=scores, minlength=len(keys))
+    active = np.bincount(codes, weights=durations, minlength=len(keys))
+    bests = np.full(len(keys), -np.inf)
+    np.maximum.at(bests, codes, scores)
+    _, first_rows = np.unique(codes, return_index=True)
+    _, last_rev = np.unique(codes[::-1], return_index=True)
+    last_rows = len(codes) - 1 - last_rev
+    return {key: (int(counts[k]), float(sums[k]), float(bests[k]), stamps.iat[first_rows[k]], stamps.iat[last_rows[k]], float(active[k]))
+            for k, key in enumerate(keys)}
+
+def merge_combo_totals(acc, b):
+    """Folds b into the accumulator acc, in place (O(len(b))), and returns acc"""
+    for key, (c, s, m, first, last, active) in b.items():
+        if key in acc:
+            c0, s0, m0, first0, last0, active0 = acc[key]
+            acc[key] = (c0 + c, s0 + s, max(m0, m), min(first0, first), max(last0, last), active0 + active)
+        else: acc[key] = (c, s, m, first, last, active)
+    return acc
+
+def _scenario_totals(totals):
+    """Folds the sens dimension away: {scenario: totals}"""
+    by_scen = {}
+    for (scen, _), t in totals.items(): merge_combo_totals(by_scen, {scen: t})
+    return by_scen
+
+def _summary_lists(keys, counts, bests, avgs, first_times, base_max, base_avg, with_pbs=True):
+    """Played / PB / average-vs-baseline lists of one report view. with_pbs=False leaves pbs to the caller."""
+    pbs, played, avgs_list = [], [], []
+    for k, key in enumerate(keys):
+        name, sens = key if isinstance(key, tuple) else (key, None)
+        best, avg, first_ts = bests[k], avgs[k], first_times[k]
+        prev = base_max.get(key)
+        is_pb = bool(prev and best > prev)
+
+        # 1. PLAYED LIST
+        played.append({
+            'name': name, 'sens': sens, 'count': int(counts[k]),
+            'best': best, 'avg': avg, 'is_pb': is_pb,
+            'time': first_ts
+        })
+
+        # 2. PB LIST (one entry per key)
+        if is_pb and with_pbs:
+            pbs.append({
+                'name': name, 'sens': sens, 'score': best,
+                'prev': prev, 'imp': best-prev, 'imp_pct': ((best-prev)/prev)*100,
+                'time': first_ts
+            })
+
+        # 3. AVERAGES LIST
+        all_avg = base_avg.get(key, avg)
+        if all_avg > 0:
+            avgs_list.append({
+                'name': name, 'sens': sens,
+                'sess_avg': avg, 'all_avg': all_avg,
+                'diff_pct': ((avg - all_avg) / all_avg) * 100,
+                'time': first_ts
+            })
+    return pbs, avgs_list, played
+
+def analyze_range(summaries, history, stack_pbs=False):
+    """
+    Multi-session report from analyze_session summaries (time order) of one date range.
+    Lists come from the merged combo totals against the history before the range; stacked
+    PBs and the graph are the sessions' own, since each session's baseline already includes
+    the earlier sessions of the range.
+    """
+    summaries = [s for s in summaries if s]
+    if not summaries: return None
+    totals = {}
+    # One accumulator: summaries' own totals are cached and stay untouched
+    for s in summaries: merge_combo_totals(totals, s['totals'])
+    start = min(t[3] for t in totals.values())
+    end = max(t[4] for t in totals.values())
+    base_grid_avg, base_scen_avg, base_grid_max, base_scen_max = history.prior_baselines(start, set(totals))
+
+    def view(name, view_totals, base_avg, base_max):
+        keys = sorted(view_totals)
+        cols = list(zip(*(view_totals[k] for k in keys)))
+        counts, sums, bests, firsts = np.array(cols[0]), np.array(cols[1]), np.array(cols[2]), list(cols[3])
+        pbs, avgs_list, played = _summary_lists(keys, counts, bests, sums / counts, firsts, base_max, base_avg, not stack_pbs)
+        if stack_pbs: pbs = [p for s in summaries for p in s[name]['lists']['pbs']]
+        graph = [p for s in summaries for p in s[name]['graph_data']]
+        return {"graph_data": graph, "lists": {"pbs": pbs, "played": played, "avgs": avgs_list}, "pb_count": len(pbs)}
+
+    return {
+        "meta": {
+            "date_str": f"{start.strftime('%b %d')} - {end.strftime('%b %d, %Y')}",
+            "duration_str": f"{len(summaries)} sessions",
+            "active_str": format_timedelta(sum(t[5] for t in totals.values())),
+            "play_count": sum(t[0] for t in totals.values())
+        },
+        "grid": view('grid', totals, base_grid_avg, base_grid_max),
+        "scenario": view('scenario', _scenario_totals(totals), base_scen_avg, base_scen_max),
+        "totals": totals
     }
\ No newline at end of file
@@ -0,0 +1,252 @@
+import os
+import json
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# --- SEGMENTED COLUMNAR HISTORY CACHE ---
+# Layout of a cache directory:
+#   schema.json            -> version + ordered list of segments + folder scan state
+#   seg_000001/            -> one append-only segment
+#       columns.json       -> row count, per-column encoding
+#       <column>.npy       -> one plain .npy array per column (memory-mappable)
+#       manifest.json      -> stats files ingested by this segment {path: mtime}
+# Refreshes only ever add a small segment; compact() folds them back into one.
+# Bump SCHEMA_VERSION whenever the on-disk encoding changes; older caches are ignored.
+SCHEMA_VERSION = 2
+SCHEMA_FILE = 'schema.json'
+COLUMNS_FILE = 'columns.json'
+MANIFEST_FILE = 'manifest.json'
+
+# Floats that round-trip exactly as hundredths (e.g. Sens) are stored as int16
+FIXED_POINT_SCALE = 100
+INT16_MAX = np.iinfo(np.int16).max
+
+# Compact once this many segments have piled up
+MAX_SEGMENTS = 8
+
+# Guards schema.json; compaction only holds it while swapping segment lists
+_LOCK = threading.Lock()
+# Segment names handed out but not yet committed to schema.json
+_RESERVED = set()
+
+def _encode_column(name, series):
+    """Returns (column meta, numpy array) for one DataFrame column"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        arr = series.to_numpy(dtype='datetime64[ns]').view('i8')
+        return {'name': name, 'kind': 'datetime'}, arr
+    if pd.api.types.is_float_dtype(series):
+        arr = series.to_numpy()
+        fixed = np.round(arr * FIXED_POINT_SCALE)
+        # Lossless only: NaN / out of range / extra decimals keep the raw floats
+        if np.all(np.abs(fixed) <= INT16_MAX) and np.array_equal(fixed / FIXED_POINT_SCALE, arr):
+            return {'name': name, 'kind': 'fixed', 'scale': FIXED_POINT_SCALE}, fixed.astype(np.int16)
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return {'name': name, 'kind': 'numeric'}, series.to_numpy()
+    # Strings: dictionary-encode so the data file stays a flat int array
+    codes, uniques = pd.factorize(series)
+    code_type = np.int16 if len(uniques) <= INT16_MAX else np.int32
+    return {'name': name, 'kind': 'category', 'categories': [str(u) for u in uniques]}, codes.astype(code_type)
+
+def _decode_column(meta, arr):
+    kind = meta['kind']
+    if kind == 'datetime': return arr.view('datetime64[ns]')
+    if kind == 'fixed': return arr.astype(np.float64) / meta['scale']
+    # Stays dictionary-encoded in memory: no Python string per row
+    if kind == 'category': return pd.Categorical.from_codes(arr, categories=meta['categories'])
+    return arr
+
+# --- SCHEMA ---
+
+def _read_schema(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, SCHEMA_FILE), 'r') as f: schema = json.load(f)
+        if schema.get('version') == SCHEMA_VERSION: return schema
+    except: pass
+    return None
+
+def _write_schema(cache_dir, segments, scan_state=None):
+    """Small file, replaced atomically: this is the commit point for every write"""
+    tmp_path = os.path.join(cache_dir, SCHEMA_FILE + '.tmp')
+    schema = {'version': SCHEMA_VERSION, 'segments': segments, 'scan': scan_state or {}}
+    with open(tmp_path, 'w') as f: json.dump(schema, f, indent=2)
+    os.replace(tmp_path, os.path.join(cache_dir, SCHEMA_FILE))
+
+def _next_segment_name(segments):
+    """Call with _LOCK held"""
+    last = max((int(s.split('_')[1]) for s in list(segments) + list(_RESERVED)), default=0)
+    name = f"seg_{last + 1:06d}"
+    _RESERVED.add(name)
+    return name
+
+def _remove_orphans(cache_dir, live_segments):
+    """Deletes segment dirs that schema.json no longer references (e.g. files still mapped on Windows last time)"""
+    for entry in os.listdir(cache_dir):
+        if entry.startswith('seg_') and entry not in live_segments and entry not in _RESERVED:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+# --- SEGMENTS ---
+
+def _write_segment(seg_dir, df, files_info):
+    shutil.rmtree(seg_dir, ignore_errors=True)
+    os.makedirs(seg_dir)
+    columns = []
+    for name in df.columns:
+        meta, arr = _encode_column(name, df[name])
+        meta['file'] = f"{name}.npy"
+        np.save(os.path.join(seg_dir, meta['file']), np.ascontiguousarray(arr), allow_pickle=False)
+        columns.append(meta)
+    with open(os.path.join(seg_dir, MANIFEST_FILE), 'w') as f: json.dump(files_info, f)
+    with open(os.path.join(seg_dir, COLUMNS_FILE), 'w') as f: json.dump({'rows': len(df), 'columns': columns}, f, indent=2)
+
+def _read_segment(seg_dir, mmap=True):
+    """Returns ({column: array}, rows, files_info)"""
+    with open(os.path.join(seg_dir, COLUMNS_FILE), 'r') as f: layout = json.load(f)
+    data = {}
+    for meta in layout['columns']:
+        # mmap: pages are faulted in on demand, no unpickling step
+        arr = np.load(os.path.join(seg_dir, meta['file']), mmap_mode='r' if mmap else None, allow_pickle=False)
+        if len(arr) != layout['rows']: raise ValueError(f"Truncated column {meta['name']}")
+        data[meta['name']] = _decode_column(meta, arr)
+    with open(os.path.join(seg_dir, MANIFEST_FILE), 'r') as f: files_info = json.load(f)
+    return data, layout['rows'], files_info
+
+def _merge_segments(cache_dir, segments, mmap=True):
+    """Concatenates segments in order. Later manifests win for files ingested twice."""
+    parts, files_info = [], {}
+    for name in segments:
+        data, rows, seg_files = _read_segment(os.path.join(cache_dir, name), mmap)
+        if rows: parts.append(data)
+        files_info.update(seg_files)
+    if not parts: return pd.DataFrame(), files_info
+    cols = list(parts[0].keys())
+    def concat(arrays):
+        if len(arrays) == 1: return arrays[0]
+        # Segments have their own dictionaries: union them, only the codes get remapped
+        if isinstance(arrays[0], pd.Categorical): return union_categoricals(arrays)
+        return np.concatenate(arrays)
+    merged = {c: concat([p[c] for p in parts]) for c in cols}
+    return pd.DataFrame(merged), files_info
+
+# --- PUBLIC API ---
+
+def load_history(cache_dir, mmap=True):
+    """Returns (df, files_info). (None, {}) if the cache is missing, stale or unreadable."""
+    cache_dir = str(cache_dir)
+    # Held for the whole read so compaction can't delete segments underneath us
+    with _LOCK:
+        schema = _read_schema(cache_dir)
+        if schema is None: return None, {}
+        try: return _merge_segments(cache_dir, schema['segments'], mmap)
+        except: return None, {}
+
+def segment_count(cache_dir):
+    with _LOCK: schema = _read_schema(str(cache_dir))
+    return len(schema['segments']) if schema else 0
+
+def read_scan_state(cache_dir):
+    """Folder scan bookkeeping saved with the last commit (see processors.scan_for_new_files)"""
+    with _LOCK: schema = _read_schema(str(cache_dir))
+    return schema.get('scan', {}) if schema else {}
+
+def update_scan_state(cache_dir, scan_state):
+    """Records a scan that found nothing to ingest"""
+    cache_dir = str(cache_dir)
+    with _LOCK:
+        schema = _read_schema(cache_dir)
+        if schema is not None: _write_schema(cache_dir, schema['segments'], scan_state)
+
+def reset_history(cache_dir, df, files_info, scan_state=None):
+    """Drops every segment and stores df as a single fresh one"""
+    cache_dir = str(cache_dir)
+    with _LOCK:
+        old_schema = _read_schema(cache_dir)
+        if old_schema is None:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            old_segments = []
+        else: old_segments = old_schema['segments']
+        os.makedirs(cache_dir, exist_ok=True)
+        name = _next_segment_name(old_segments)
+        _write_segment(os.path.join(cache_dir, name), df, files_info)
+        _write_schema(cache_dir, [name], scan_state)
+        _RESERVED.discard(name)
+    for old in old_segments: shutil.rmtree(os.path.join(cache_dir, old), ignore_errors=True)
+
+def append_segment(cache_dir, new_df, new_files_info, scan_state=None):
+    """Writes only the new rows + their manifest. Cost is O(new rows), not O(history)."""
+    cache_dir = str(cache_dir)
+    with _LOCK:
+        schema = _read_schema(cache_dir)
+        if schema is None: raise ValueError("No cache to append to")
+        name = _next_segment_name(schema['segments'])
+        _write_segment(os.path.join(cache_dir, name), new_df, new_files_info)
+        _write_schema(cache_dir, schema['segments'] + [name], scan_state if scan_state is not None else schema.get('scan'))
+        _RESERVED.discard(name)
+        return len(schema['segments']) + 1
+
+# --- DERIVED ARRAYS ---
+# Caches computed from the history (e.g. enrichment state). Not part of the segment list:
+# callers validate them against the history they load.
+
+def save_arrays(cache_dir, name, arrays, meta):
+    """Writes {name: array} + a JSON meta. The meta goes last, so a torn write never validates."""
+    target = os.path.join(str(cache_dir), name)
+    os.makedirs(target, exist_ok=True)
+    try: os.remove(os.path.join(target, 'meta.json'))
+    except OSError: pass
+    meta = dict(meta, arrays={k: len(v) for k, v in arrays.items()})
+    for key, arr in arrays.items():
+        np.save(os.path.join(target, f"{key}.npy"), np.ascontiguousarray(arr), allow_pickle=False)
+    tmp_path = os.path.join(target, 'meta.json.tmp')
+    with open(tmp_path, 'w') as f: json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(target, 'meta.json'))
+
+def load_arrays(cache_dir, name):
+    """Returns ({name: array}, meta) or (None, None)"""
+    target = os.path.join(str(cache_dir), name)
+    try:
+        with open(os.path.join(target, 'meta.json'), 'r') as f: meta = json.load(f)
+        arrays = {}
+        for key, rows in meta['arrays'].items():
+            arr = np.load(os.path.join(target, f"{key}.npy"), allow_pickle=False)
+            if len(arr) != rows: return None, None
+            arrays[key] = arr
+        return arrays, meta
+    except: return None, None
+
+def needs_compaction(segment_count): return segment_count > MAX_SEGMENTS
+
+def compact(cache_dir):
+    """Folds all current segments into one. Safe to run on a background thread."""
+    cache_dir = str(cache_dir)
+    with _LOCK:
+        schema = _read_schema(cache_dir)
+        if schema is None or len(schema['segments']) <= 1: return
+        snapshot = list(schema['segments'])
+        name = _next_segment_name(snapshot)
+
+    # Heavy part runs unlocked; appends made meanwhile land after the snapshot
+    try:
+        df, files_info = _merge_segments(cache_dir, snapshot, mmap=False)
+        _write_segment(os.path.join(cache_dir, name), df, files_info)
+    except:
+        with _LOCK: _RESERVED.discard(name)
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        return
+
+    with _LOCK:
+        _RESERVED.discard(name)
+        current = _read_schema(cache_dir)
+        if current is None or current['segments'][:len(snapshot)] != snapshot:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+            return
+        live = [name] + current['segments'][len(snapshot):]
+        _write_schema(cache_dir, live, current.get('scan'))
+        _remove_orphans(cache_dir, live)
+
+def compact_in_background(cache_dir):
+    t = threading.Thread(target=compact, args=(cache_dir,), daemon=True)
+    t.start()
+    return t
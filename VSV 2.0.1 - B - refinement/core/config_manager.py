@@ -9,6 +9,10 @@ DEFAULT_SETTINGS = {
     "global": {
         "stats_path": "",
         "session_gap": 30,
+        "parse_workers": 0,  # 0 = auto (CPU count - 1)
+        "rank_tiers": [["SINGULARITY", 100, True], ["ARCADIA", 95, True], ["UBER", 90, True],
+                       ["EXALTED", 82, False], ["BLESSED", 75, False], ["TRANSMUTE", 55, False]],
+        "rank_gate_runs": 10,  # Runs on a combo before gated tiers count
         "theme": "dark",
         "app_layout": {},
         "open_tabs": []
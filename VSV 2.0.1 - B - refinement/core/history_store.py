@@ -0,0 +1,277 @@
+import itertools
+import numpy as np
+import pandas as pd
+from functools import cached_property
+from core.analytics.order_stats import running_quantile
+
+_VERSIONS = itertools.count(1)
+COMBO_KEYS = ['Scenario', 'Sens']
+
+def _combo_aggregates(df):
+    """Score aggregates per (Scenario, Sens), index levels as plain values"""
+    g = df.groupby(COMBO_KEYS, observed=True)['Score']
+    out = pd.DataFrame({'count': g.size(), 'mean': g.mean(), 'max': g.max(), 'p75': g.quantile(0.75)})
+    if isinstance(out.index.levels[0], pd.CategoricalIndex):
+        out.index = out.index.set_levels(out.index.levels[0].astype(object), level=0)
+    return out
+
+# --- DAILY ROLLUP ---
+ROLLUP_COLUMNS = ['runs', 'duration', 'pbs_scen_stacked', 'pbs_scen_unique', 'pbs_sens_stacked', 'pbs_sens_unique', 'sessions']
+
+def day_number(ts):
+    """Days since 1970-01-01 for timestamps / datetime64 arrays (the rollup index)"""
+    return np.asarray(ts, dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+def _daily_rollup(df):
+    """
+    Per calendar day: runs, active seconds, PB counts and session ids, in one grouped pass.
+    PBs exclude a combo's first run; stacked = every PB run, unique = distinct scenarios / combos.
+    """
+    days = day_number(df['Timestamp'])
+    first = df['Is_First'].to_numpy() if 'Is_First' in df.columns else np.zeros(len(df))
+    scen_pb = (df['Is_Scen_PB'].to_numpy() == 1) & (first == 0)
+    sens_pb = (df['Is_PB'].to_numpy() == 1) & (first == 0)
+    scen = df['Scenario'].to_numpy()
+    sens = df['Sens'].to_numpy()
+    parts = pd.DataFrame({'day': days, 'duration': df['Duration'].to_numpy(),
+                          'scen_pb': scen_pb, 'sens_pb': sens_pb, 'session': df['SessionID'].to_numpy()})
+    g = parts.groupby('day', sort=True)
+    out = pd.DataFrame({'runs': g.size(), 'duration': g['duration'].sum(),
+                        'pbs_scen_stacked': g['scen_pb'].sum(), 'pbs_sens_stacked': g['sens_pb'].sum()})
+    out['pbs_scen_unique'] = pd.DataFrame({'day': days[scen_pb], 'scen': scen[scen_pb]}).drop_duplicates().groupby('day').size()
+    out['pbs_sens_unique'] = pd.DataFrame({'day': days[sens_pb], 'scen': scen[sens_pb], 'sens': sens[sens_pb]}).drop_duplicates().groupby('day').size()
+    out['sessions'] = parts[['day', 'session']].drop_duplicates().groupby('day')['session'].agg(list)
+    out[['pbs_scen_unique', 'pbs_sens_unique']] = out[['pbs_scen_unique', 'pbs_sens_unique']].fillna(0).astype(np.int64)
+    return out[ROLLUP_COLUMNS]
+
+# --- TIME ROLLUP CUBE ---
+# Score count / sum / max / min and last run time per (Scenario, Sens, period).
+# Periods are integers: day number, Monday-based week, month index or SessionID; the
+# day / week / month bins match pd.Grouper(freq='D' / 'W' / 'M').
+CUBE_GRAINS = ['day', 'week', 'month', 'session']
+
+def period_keys(df, grain):
+    if grain == 'session': return df['SessionID'].to_numpy()
+    ts = df['Timestamp'].to_numpy(dtype='datetime64[ns]')
+    if grain == 'month': return ts.astype('datetime64[M]').astype(np.int64)
+    days = day_number(ts)
+    return (days + 3) // 7 if grain == 'week' else days # 1970-01-01 was a Thursday
+
+def _time_rollup(df, grain):
+    g = df.groupby([df['Scenario'], df['Sens'], pd.Series(period_keys(df, grain), index=df.index, name='period')], observed=True)
+    score = g['Score']
+    out = pd.DataFrame({'count': score.size(), 'sum': score.sum(), 'max': score.max(), 'min': score.min(), 'last': g['Timestamp'].max()})
+    if isinstance(out.index.levels[0], pd.CategoricalIndex):
+        out.index = out.index.set_levels(out.index.levels[0].astype(object), level=0)
+    return out
+
+class HistoryStore:
+    """
+    Owns the time sorted run history plus row indexes over it, so widgets slice instead of
+    masking the full DataFrame. Indexes are built lazily, once per published history.
+    - scenario / (scenario, sens): row positions (ascending = time order) -> O(k) take
+    - session / day / time range: contiguous in time order -> O(log n) binary search + slice
+    """
+    def __init__(self, df, previous=None):
+        if df is not None and not df.empty and not df['Timestamp'].is_monotonic_increasing:
+            df = df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+        self.df = df if df is not None else pd.DataFrame()
+        self.version = next(_VERSIONS)
+        self._running_p75 = {} # (index name, key) -> p75 after each of the key's runs, built on first use
+        # Aggregates of a previous version this one only appends to (see combo_stats / daily_rollup)
+        self._bases, self._n_old = {}, 0
+        if previous is not None:
+            bases = {name: previous.__dict__[name] for name in ('combo_stats', 'daily_rollup', 'time_cube') if name in previous.__dict__}
+            if bases and self._extends(previous.df): self._bases, self._n_old = bases, len(previous.df)
+
+    def _extends(self, old):
+        """True if old is a row-for-row prefix of this history"""
+        n = len(old)
+        if n == 0 or n > len(self.df): return False
+        for col in ['Timestamp', 'Score', 'Sens', 'Scenario']:
+            if not np.array_equal(self.df[col].iloc[:n].to_numpy(), old[col].to_numpy()): return False
+        return True
+
+    @property
+    def empty(self): return self.df.empty
+
+    # --- INDEXES ---
+    @cached_property
+    def _timestamps(self): return self.df['Timestamp'].to_numpy()
+
+    @cached_property
+    def _session_ids(self): return self.df['SessionID'].to_numpy()
+
+    @cached_property
+    def _scenario_rows(self):
+        return self.df.groupby('Scenario', observed=True, sort=False).indices if not self.empty else {}
+
+    @cached_property
+    def _combo_rows(self):
+        return self.df.groupby(COMBO_KEYS, observed=True, sort=False).indices if not self.empty else {}
+
+    def _cut(self, rows, before):
+        """Positions of rows strictly before a timestamp"""
+        if before is None: return rows
+        return rows[:self._timestamps[rows].searchsorted(pd.Timestamp(before).to_datetime64(), 'left')]
+
+    def _take(self, rows):
+        if rows is None or len(rows) == 0: return self.df.iloc[:0]
+        return self.df.iloc[rows]
+
+    # --- SHARED AGGREGATES ---
+    @cached_property
+    def combo_stats(self):
+        """
+        Score count / mean / max / p75 per (Scenario, Sens), computed once per data version and
+        shared by every widget. A version that only appended runs recomputes just the combos
+        those runs touched.
+        """
+        if self.empty: return pd.DataFrame(columns=['count', 'mean', 'max', 'p75'])
+        base = self._bases.pop('combo_stats', None)
+        if base is None: return _combo_aggregates(self.df)
+        new_runs = self.df.iloc[self._n_old:]
+        if new_runs.empty: return base
+        touched = list(new_runs.groupby(COMBO_KEYS, observed=True).indices)
+        rows = np.sort(np.concatenate([self._combo_rows[k] for k in touched]))
+        fresh = _combo_aggregates(self.df.iloc[rows])
+        return pd.concat([base.drop(index=fresh.index, errors='ignore'), fresh]).sort_index()
+
+    @cached_property
+    def daily_rollup(self):
+        """
+        Calendar rollup indexed by day_number(): runs, duration, stacked / unique scenario and
+        sens PB counts, session ids. Appended runs only recompute the days they land on.
+        """
+        if self.empty: return pd.DataFrame(columns=ROLLUP_COLUMNS)
+        base = self._bases.pop('daily_rollup', None)
+        if base is None: return _daily_rollup(self.df)
+        if self._n_old == len(self.df): return base
+        # Days are contiguous in time order: redo everything from the first new run's day on
+        first_day = day_number(self._timestamps[self._n_old:self._n_old + 1])[0]
+        start = self._timestamps.searchsorted(np.datetime64(int(first_day), 'D'), 'left')
+        fresh = _daily_rollup(self.df.iloc[start:])
+        return pd.concat([base[base.index < first_day], fresh])
+
+    @cached_property
+    def time_cube(self):
+        """{grain: rollup} for CUBE_GRAINS, see _time_rollup. Appended runs only redo their periods."""
+        if self.empty: return {grain: _time_rollup(self.df, grain) for grain in CUBE_GRAINS}
+        base = self._bases.pop('time_cube', None)
+        if base is None: return {grain: _time_rollup(self.df, grain) for grain in CUBE_GRAINS}
+        if self._n_old == len(self.df): return base
+        cube = {}
+        for grain in CUBE_GRAINS:
+            # Periods are contiguous in time order: redo everything from the first new run's period on
+            keys = period_keys(self.df, grain)
+            first = keys[self._n_old]
+            start = np.searchsorted(keys, first, 'left')
+            old = base[grain]
+            cube[grain] = pd.concat([old[old.index.get_level_values('period') < first], _time_rollup(self.df.iloc[start:], grain)]).sort_index()
+        return cube
+
+    def period_rollup(self, grain, scenario, sens=None):
+        """count / sum / max / min / last per period of one combo, or of a scenario across all sens"""
+        cube = self.time_cube[grain]
+        if sens is not None:
+            try: return cube.loc[(scenario, sens)]
+            except KeyError: return cube.iloc[:0].droplevel([0, 1])
+        try: rows = cube.xs(scenario, level='Scenario')
+        except KeyError: return cube.iloc[:0].droplevel([0, 1])
+        g = rows.groupby(level='period')
+        return pd.DataFrame({'count': g['count'].sum(), 'sum': g['sum'].sum(), 'max': g['max'].max(), 'min': g['min'].min(), 'last': g['last'].max()})
+
+    # --- PRIOR HISTORY BASELINES ---
+    @cached_property
+    def _running_aggs(self):
+        """Per row: count / sum / max of its combo's and its scenario's runs up to and including it"""
+        out = {}
+        for name, keys in (('combo', COMBO_KEYS), ('scenario', 'Scenario')):
+            g = self.df.groupby(keys, observed=True, sort=False)['Score']
+            out[name] = (g.cumcount().to_numpy() + 1, g.cumsum().to_numpy(), g.cummax().to_numpy())
+        return out
+
+    def prior_baselines(self, before, combos):
+        """
+        Mean / max of every (scenario, sens) in combos and of their scenarios over the runs strictly
+        before a timestamp. Returns (grid_avg, scen_avg, grid_max, scen_max) dicts, keys without
+        prior runs left out. Each key is a binary search into its row index, no rescan.
+        """
+        grid_avg, scen_avg, grid_max, scen_max = {}, {}, {}, {}
+        if self.empty: return grid_avg, scen_avg, grid_max, scen_max
+        cutoff = self._cutoff(before)
+        for key_set, name, avg, mx in ((combos, 'combo', grid_avg, grid_max),
+                                       ({c[0] for c in combos}, 'scenario', scen_avg, scen_max)):
+            counts, sums, maxes = self._running_aggs[name]
+            for key in key_set:
+                k, last = self._prior_run(name, key, cutoff)
+                if not k: continue
+                avg[key] = sums[last] / counts[last]
+                mx[key] = maxes[last]
+        return grid_avg, scen_avg, grid_max, scen_max
+
+    def prior_stats(self, key, before):
+        """
+        As-of stats of a scenario (str) or (scenario, sens) over its runs strictly before a timestamp:
+        {'count', 'max', 'mean', 'p75'}, or None without prior runs. O(log k) once the key's
+        running p75 exists.
+        """
+        if self.empty: return None
+        name = 'combo' if isinstance(key, tuple) else 'scenario'
+        k, last = self._prior_run(name, key, self._cutoff(before))
+        if not k: return None
+        counts, sums, maxes = self._running_aggs[name]
+        p75 = self._running_p75.get((name, key))
+        if p75 is None:
+            p75 = self._running_p75[(name, key)] = running_quantile(self.df['Score'].to_numpy()[self._row_index(name)[key]].tolist(), 0.75)
+        return {'count': k, 'max': maxes[last], 'mean': sums[last] / counts[last], 'p75': p75[k - 1]}
+
+    def _row_index(self, name): return self._combo_rows if name == 'combo' else self._scenario_rows
+
+    def _cutoff(self, before): return self._timestamps.searchsorted(pd.Timestamp(before).to_datetime64(), 'left')
+
+    def _prior_run(self, name, key, cutoff):
+        """(number of the key's runs before row cutoff, row of the last one)"""
+        rows = self._row_index(name).get(key)
+        if rows is None: return 0, None
+        # Rows are ascending positions, so "before the cutoff" is a prefix of them
+        k = rows.searchsorted(cutoff)
+        return k, (rows[k - 1] if k else None)
+
+    # --- LOOKUPS ---
+    def scenario(self, name, before=None):
+        """All runs of a scenario (any sens), optionally only those before a timestamp"""
+        rows = self._scenario_rows.get(name)
+        return self._take(self._cut(rows, before) if rows is not None else None)
+
+    def combo(self, name, sens, before=None):
+        rows = self._combo_rows.get((name, sens))
+        return self._take(self._cut(rows, before) if rows is not None else None)
+
+    def scenarios(self): return list(self._scenario_rows.keys())
+
+    def session(self, session_id):
+        if self.empty: return self.df
+        ids = self._session_ids
+        return self.df.iloc[ids.searchsorted(session_id, 'left'):ids.searchsorted(session_id, 'right')]
+
+    def between(self, start, end):
+        """Runs with start <= Timestamp < end"""
+        if self.empty: return self.df
+        ts = self._timestamps
+        a = ts.searchsorted(pd.Timestamp(start).to_datetime64(), 'left')
+        b = ts.searchsorted(pd.Timestamp(end).to_datetime64(), 'left')
+        return self.df.iloc[a:b]
+
+    def count_before(self, timestamp):
+        """Number of runs strictly before a timestamp"""
+        return 0 if self.empty else int(self._cutoff(timestamp))
+
+    def before(self, timestamp):
+        if self.empty: return self.df
+        return self.df.iloc[:self.count_before(timestamp)]
+
+    def day(self, date):
+        """Runs on a calendar day (date, datetime or 'YYYY-MM-DD')"""
+        start = pd.Timestamp(date).normalize()
+        return self.between(start, start + pd.Timedelta(days=1))
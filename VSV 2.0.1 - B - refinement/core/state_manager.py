@@ -1,4 +1,6 @@
 from PyQt6.QtCore import QObject, pyqtSignal
+from core.history_store import HistoryStore
+from core.analytics.session_cache import SessionSummaryCache
 
 class StateManager(QObject):
     """
@@ -9,9 +11,22 @@ class StateManager(QObject):
     variant_selected = pyqtSignal(dict) 
     settings_changed = pyqtSignal() 
     session_selected = pyqtSignal(int)
+    range_selected = pyqtSignal(object, object) # Multi-session report: start, end (exclusive)
+    sessions_relabelled = pyqtSignal(object) # Same runs, SessionIDs regrouped (session gap change)
     
     # NEW: Updates the main window header
     chart_title_changed = pyqtSignal(str) 
 
     def __init__(self):
-        super().__init__()
\ No newline at end of file
+        super().__init__()
+        self.history = HistoryStore(None) # Indexed view of the last published history
+        self.session_summaries = SessionSummaryCache() # analyze_session results, persisted
+
+    def publish_data(self, df):
+        """Rebuilds the history index, then notifies every widget"""
+        self.history = HistoryStore(df, previous=self.history)
+        self.data_updated.emit(df)
+
+    def publish_relabelled(self, df):
+        self.history = HistoryStore(df)
+        self.sessions_relabelled.emit(df)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QDockWidget, QLabel, QSplitter, 
                              QMenu, QPushButton, QHBoxLayout, QVBoxLayout, QWidget, 
                              QFileDialog, QDialog, QFormLayout, QSpinBox, QMessageBox,
@@ -37,6 +38,13 @@ class SettingsDialog(QDialog):
         self.sb_gap.setSuffix(" min")
         form.addRow("Session Gap:", self.sb_gap)
         
+        # Rank Gating
+        self.sb_gate = QSpinBox()
+        self.sb_gate.setRange(1, 1000)
+        self.sb_gate.setValue(self.config_manager.get("rank_gate_runs", default=10))
+        self.sb_gate.setSuffix(" runs")
+        form.addRow("Top Rank Gate:", self.sb_gate)
+        
         # Startup Tab
         self.cb_startup = QComboBox()
         self.cb_startup.addItems(["Last", "Calendar", "Ongoing", "Session Report", "Career Profile"])
@@ -46,14 +54,14 @@ class SettingsDialog(QDialog):
         
         layout.addLayout(form)
         
-        lbl_info = QLabel("Note: Changing Session Gap will reload all stats.")
+        lbl_info = QLabel("Note: Session Gap and rank changes apply instantly. Rank tiers can be edited as \"rank_tiers\" in v2_config.json.")
         lbl_info.setStyleSheet("color: #787b86; font-size: 11px; font-style: italic;")
         lbl_info.setWordWrap(True)
         layout.addWidget(lbl_info)
         layout.addStretch()
         
         btn_box = QHBoxLayout()
-        btn_save = QPushButton("Save & Reload"); btn_save.clicked.connect(self.accept)
+        btn_save = QPushButton("Save & Apply"); btn_save.clicked.connect(self.accept)
         btn_cancel = QPushButton("Cancel"); btn_cancel.clicked.connect(self.reject)
         btn_box.addStretch(); btn_box.addWidget(btn_cancel); btn_box.addWidget(btn_save)
         layout.addLayout(btn_box)
@@ -61,6 +69,7 @@ class SettingsDialog(QDialog):
     def get_values(self):
         return {
             "session_gap": self.sb_gap.value(),
+            "rank_gate_runs": self.sb_gate.value(),
             "startup_tab_mode": self.cb_startup.currentText()
         }
 
@@ -68,18 +77,50 @@ class SettingsDialog(QDialog):
 class DataLoader(QThread):
     finished = pyqtSignal(object)
     
-    def __init__(self, path, session_gap): 
+    def __init__(self, path, session_gap, workers=0, rank_settings=(None, None)): 
         super().__init__()
         self.path = path
         self.session_gap = session_gap
+        self.workers = workers
+        self.rank_tiers, self.gate_runs = rank_settings
 
     def run(self):
         # Pass the gap to the processor
-        df = engine.find_and_process_stats(self.path, session_gap_minutes=self.session_gap)
+        df = engine.find_and_process_stats(self.path, session_gap_minutes=self.session_gap, workers=self.workers)
         if df is not None and not df.empty: 
-            df = engine.enrich_history_with_stats(df)
+            df = engine.enrich_history_with_stats(df, persist=True, rank_tiers=self.rank_tiers, gate_runs=self.gate_runs)
         self.finished.emit(df)
 
+# --- LIVE INGEST THREAD ---
+class LiveIngestor(QThread):
+    finished = pyqtSignal(object)
+    
+    def __init__(self, path, history_df, session_gap, rank_settings=(None, None)):
+        super().__init__()
+        self.path = path
+        self.history_df = history_df
+        self.session_gap = session_gap
+        self.rank_tiers, self.gate_runs = rank_settings
+
+    def run(self):
+        # Only the files that just appeared are parsed; None = nothing new
+        df = engine.ingest_new_runs(self.path, self.history_df, session_gap_minutes=self.session_gap)
+        if df is not None:
+            df = engine.enrich_history_with_stats(df, rank_tiers=self.rank_tiers, gate_runs=self.gate_runs)
+        self.finished.emit(df)
+
+# --- SESSION SUMMARY WARM-UP ---
+class SummaryWarmer(QThread):
+    """Precomputes recent session reports so opening them is a cache hit"""
+    def __init__(self, summary_cache, history, stack_pbs):
+        super().__init__()
+        self.summary_cache = summary_cache
+        self.history = history
+        self.stack_pbs = stack_pbs
+
+    def run(self):
+        self.summary_cache.warm(self.history, self.stack_pbs, should_stop=self.isInterruptionRequested)
+
 class KovaaksV2App(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -91,14 +132,25 @@ class KovaaksV2App(QMainWindow):
         self.config_manager = ConfigManager()
         self.current_stats_path = None
         self.is_initial_load = True
+        self.history_df = None
+        self.worker = None
+        self.ingestor = None
+        self.warmer = None
+        # Full load requested while another load / ingest was running
+        self.pending_load = None
         
-        # Auto-Refresh Logic
+        # Auto-Refresh Logic: new run files are ingested on their own, no full reload
         self.file_watcher = QFileSystemWatcher(self)
         self.file_watcher.directoryChanged.connect(self.on_dir_changed)
         self.debounce_timer = QTimer(self)
         self.debounce_timer.setSingleShot(True)
-        self.debounce_timer.setInterval(2000) # Wait 2 seconds after file write
-        self.debounce_timer.timeout.connect(self.refresh_stats)
+        self.debounce_timer.setInterval(300) # KovaaK's writes a run file in one go
+        self.debounce_timer.timeout.connect(self.ingest_new_runs)
+        # Session summaries are pickled once things go quiet (and on close), not after every run
+        self.summary_save_timer = QTimer(self)
+        self.summary_save_timer.setSingleShot(True)
+        self.summary_save_timer.setInterval(120000)
+        self.summary_save_timer.timeout.connect(self.save_session_summaries)
         
         # Listen for chart titles to update header
         self.state_manager.chart_title_changed.connect(self.update_header_title)
@@ -227,8 +279,27 @@ class KovaaksV2App(QMainWindow):
             self.config_manager.set_global("session_gap", new_gap)
             self.config_manager.set_global("startup_tab_mode", vals["startup_tab_mode"])
             
-            if old_gap != new_gap:
+            old_gate = self.config_manager.get("rank_gate_runs", default=10)
+            self.config_manager.set_global("rank_gate_runs", vals["rank_gate_runs"])
+            
+            # Both rewrite a copy: the ingest / warm-up threads may still be reading the current frame
+            if old_gap != new_gap and self.history_df is not None:
+                # Gaps between runs are stored: regroup in memory, no reload
+                self.history_df = engine.relabel_sessions(self.history_df.copy(), new_gap)
+                self.stop_warmer()
+                self.state_manager.session_summaries.clear()
+                self.state_manager.publish_relabelled(self.history_df)
+                self.warm_session_summaries()
+            elif old_gap != new_gap:
                 self.refresh_stats()
+            if old_gate != vals["rank_gate_runs"] and self.history_df is not None:
+                # Ranks derive from the stored percentiles: no reload needed
+                self.history_df = engine.apply_rank_tiers(self.history_df.copy(), *self.rank_settings())
+                self.state_manager.publish_data(self.history_df)
+
+    def rank_settings(self):
+        return (self.config_manager.get("rank_tiers", default=None),
+                self.config_manager.get("rank_gate_runs", default=10))
 
     # --- WATCHER LOGIC ---
     def update_watcher(self, path):
@@ -251,6 +322,51 @@ class KovaaksV2App(QMainWindow):
         # File added or deleted. Start/Restart debounce timer.
         self.debounce_timer.start()
 
+    def ingest_new_runs(self):
+        if not self.current_stats_path: return
+        # A load or ingest is still running -> retry once it's done
+        if (self.worker and self.worker.isRunning()) or (self.ingestor and self.ingestor.isRunning()):
+            self.debounce_timer.start()
+            return
+        if self.history_df is None or self.history_df.empty:
+            self.refresh_stats()
+            return
+        
+        gap = self.config_manager.get("session_gap", default=30)
+        self.ingestor = LiveIngestor(self.current_stats_path, self.history_df, gap, self.rank_settings())
+        self.ingestor.finished.connect(self.on_runs_ingested)
+        self.ingestor.start()
+
+    def on_runs_ingested(self, df):
+        # A queued full reload supersedes this ingest (it rescans the same files)
+        if self.start_pending_load(): return
+        if df is None: return
+        if self.ingestor.history_df is not self.history_df:
+            # Loads never overlap an ingest, so the preferences rebuilt the history meanwhile:
+            # bring the ingested frame (old gap / tiers) in line with the current settings
+            engine.relabel_sessions(df, self.config_manager.get("session_gap", default=30))
+            engine.apply_rank_tiers(df, *self.rank_settings())
+        self.history_df = df
+        self.state_manager.publish_data(df)
+        self.warm_session_summaries()
+
+    def stop_warmer(self):
+        if self.warmer and self.warmer.isRunning():
+            self.warmer.requestInterruption()
+            self.warmer.wait()
+
+    def warm_session_summaries(self):
+        self.stop_warmer()
+        stack = self.config_manager.get("session_stack_pbs", default=False)
+        self.warmer = SummaryWarmer(self.state_manager.session_summaries, self.state_manager.history, stack)
+        self.warmer.start(QThread.Priority.IdlePriority)
+        self.summary_save_timer.start()
+
+    def save_session_summaries(self):
+        # Warm-up still running -> try again later rather than block the UI
+        if self.warmer and self.warmer.isRunning(): self.summary_save_timer.start()
+        else: self.state_manager.session_summaries.save()
+
     # --- LOADING LOGIC ---
 
     def auto_load(self):
@@ -284,17 +400,40 @@ class KovaaksV2App(QMainWindow):
         
         self.btn_refresh.setEnabled(False)
         self.btn_refresh.setText("Loading...")
+
+        # One ingestion at a time: loader and ingestor scan the same files and append to the same cache
+        if (self.worker and self.worker.isRunning()) or (self.ingestor and self.ingestor.isRunning()):
+            self.pending_load = path
+            return
         
         gap = self.config_manager.get("session_gap", default=30)
+        workers = self.config_manager.get("parse_workers", default=0)
         
-        self.worker = DataLoader(path, gap) 
+        self.worker = DataLoader(path, gap, workers, self.rank_settings()) 
         self.worker.finished.connect(self.on_data_loaded)
         self.worker.start()
 
+    def start_pending_load(self):
+        if not self.pending_load: return False
+        path, self.pending_load = self.pending_load, None
+        # Called from a finished signal, emitted before run() returns
+        for thread in (self.worker, self.ingestor):
+            if thread: thread.wait()
+        self.start_loading(path)
+        return True
+
     def on_data_loaded(self, df):
+        if self.start_pending_load(): return
         self.btn_refresh.setEnabled(True)
         self.btn_refresh.setText("Refresh (F5)")
-        self.state_manager.data_updated.emit(df)
+        # Preferences changed while loading -> apply them to the loaded frame
+        gap = self.config_manager.get("session_gap", default=30)
+        if df is not None and self.worker.session_gap != gap: engine.relabel_sessions(df, gap)
+        if df is not None and (self.worker.rank_tiers, self.worker.gate_runs) != self.rank_settings():
+            engine.apply_rank_tiers(df, *self.rank_settings())
+        self.history_df = df
+        self.state_manager.publish_data(df)
+        if df is not None and not df.empty: self.warm_session_summaries()
         
         if self.is_initial_load:
             self.grid_container.restore_state()
@@ -309,6 +448,8 @@ class KovaaksV2App(QMainWindow):
         }
         self.config_manager.set_global("app_layout", settings)
         self.grid_container.save_state()
+        self.stop_warmer()
+        self.state_manager.session_summaries.save()
         super().closeEvent(event)
 
     def load_app_state(self):
@@ -326,6 +467,7 @@ class KovaaksV2App(QMainWindow):
             self.center_splitter.setStretchFactor(1, 6)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # Parser pool workers in packaged builds
     app = QApplication(sys.argv)
     window = KovaaksV2App()
     window.show()
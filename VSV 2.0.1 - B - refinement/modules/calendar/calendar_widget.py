@@ -11,6 +11,9 @@ from PyQt6.QtGui import QColor
 from modules.calendar.day_cell import DayCell
 from modules.calendar.daily_activity import DailyActivityWidget
 
+# Day numbers (HistoryStore.daily_rollup index) count from here
+EPOCH = datetime.date(1970, 1, 1)
+
 class DayDetailWidget(QWidget):
     def __init__(self, state_manager, config_manager):
         super().__init__()
@@ -85,10 +88,11 @@ class DayDetailWidget(QWidget):
     def refresh_table(self):
         if self.day_df is None or self.day_df.empty: return
         group_by_scen = self.chk_group.isChecked()
-        if group_by_scen: grouped = self.day_df.groupby('Scenario')
-        else: grouped = self.day_df.groupby(['Scenario', 'Sens'])
+        if group_by_scen: grouped = self.day_df.groupby('Scenario', observed=True)
+        else: grouped = self.day_df.groupby(['Scenario', 'Sens'], observed=True)
         
         day_start_ts = pd.Timestamp(self.current_date_str)
+        history = self.state_manager.history
         
         rows = []
         for key, group in grouped:
@@ -96,20 +100,16 @@ class DayDetailWidget(QWidget):
             sens = None if group_by_scen else key[1]
             best_score = group['Score'].max(); run_count = len(group)
             
-            if group_by_scen: hist = self.full_df[self.full_df['Scenario'] == scen]
-            else: hist = self.full_df[(self.full_df['Scenario'] == scen) & (self.full_df['Sens'] == sens)]
-            
-            prev_runs = hist[hist['Timestamp'] < day_start_ts]
+            # As-of-day stats from the history's running aggregates, no rescan
+            prev = history.prior_stats(key, day_start_ts)
             
             prev_pb = 0; avg = 0; p75 = 0
-            if not prev_runs.empty:
-                prev_pb = prev_runs['Score'].max()
-                avg = prev_runs['Score'].mean()
-                p75 = prev_runs['Score'].quantile(0.75)
+            if prev is not None:
+                prev_pb, avg, p75 = prev['max'], prev['mean'], prev['p75']
             
             gain_val = 0; gain_pct = 0; pb_status = "NONE"; vs_pb_pct = 0
             
-            if prev_runs.empty: pb_status = "NEW"
+            if prev is None: pb_status = "NEW"
             elif best_score > prev_pb:
                 pb_status = "PB"
                 gain_val = best_score - prev_pb
@@ -193,8 +193,10 @@ class CalendarWidget(QWidget):
         self.config_manager = ConfigManager()
         
         self.full_df = None
-        self.current_date = QDate.currentDate(); self.selected_date = None; self.daily_stats = {} 
+        self.current_date = QDate.currentDate(); self.selected_date = None
+        self.daily_stats = None # HistoryStore.daily_rollup, indexed by day number
         self.setup_ui(); self.state_manager.data_updated.connect(self.on_data_updated)
+        self.state_manager.sessions_relabelled.connect(self.on_data_updated)
 
     def setup_ui(self):
         layout = QVBoxLayout(self); layout.setContentsMargins(10,10,10,10)
@@ -265,41 +267,19 @@ class CalendarWidget(QWidget):
     def on_data_updated(self, df):
         if df is None: return
         self.full_df = df
-        
-        if 'DateStr' not in df.columns:
-            df['DateStr'] = df['Timestamp'].dt.strftime('%Y-%m-%d')
-            
-        grouped = df.groupby('DateStr')
-        self.daily_stats = {}
-        
-        for date_str, group in grouped:
-            valid_sens_pbs = group[(group['Is_PB'] == 1) & (group.get('Is_First', False) == 0)]
-            valid_scen_pbs = group[(group['Is_Scen_PB'] == 1) & (group.get('Is_First', False) == 0)]
+        # Shared per-day rollup: one grouped pass, appended runs only redo their days
+        self.daily_stats = self.state_manager.history.daily_rollup
             
-            unique_scen_cnt = valid_scen_pbs['Scenario'].nunique()
-            unique_sens_cnt = valid_sens_pbs.groupby(['Scenario', 'Sens']).ngroups
-            
-            stats = {
-                'runs': len(group),
-                'duration': group['Duration'].sum(),
-                'pbs_scen_stacked': len(valid_scen_pbs),
-                'pbs_scen_unique': unique_scen_cnt,
-                'pbs_sens_stacked': len(valid_sens_pbs),
-                'pbs_sens_unique': unique_sens_cnt,
-                'sessions': group['SessionID'].unique().tolist()
-            }
-            self.daily_stats[date_str] = stats
-            
-        if self.daily_stats:
-            latest_str = max(self.daily_stats.keys())
-            latest_py_date = datetime.datetime.strptime(latest_str, '%Y-%m-%d').date()
+        if not self.daily_stats.empty:
+            latest_py_date = EPOCH + datetime.timedelta(days=int(self.daily_stats.index[-1]))
+            latest_str = latest_py_date.strftime('%Y-%m-%d')
             
             self.current_date = QDate(latest_py_date.year, latest_py_date.month, 1)
             self.selected_date = latest_py_date
             
             self.update_calendar()
             
-            day_df = df[df['DateStr'] == latest_str].copy()
+            day_df = self.state_manager.history.day(latest_str).copy()
             self.detail_panel.load_day(latest_str, day_df, df)
             self.activity_graph.load_data(day_df, self.chk_stack.isChecked())
         else:
@@ -308,20 +288,26 @@ class CalendarWidget(QWidget):
     def update_calendar(self):
         year, month = self.current_date.year(), self.current_date.month()
         self.lbl_month.setText(f"{calendar.month_name[month]} {year}")
-        month_prefix = f"{year}-{month:02d}"
-        month_durations = [v['duration'] for k,v in self.daily_stats.items() if k.startswith(month_prefix)]
-        max_act = max(month_durations) if month_durations else 3600
-        
         first_day = QDate(year, month, 1)
         start_day_of_week = first_day.dayOfWeek() - 1
         current_grid_date = first_day.addDays(-start_day_of_week)
         
+        # Day numbers: month range for the activity scale, grid range for the cells
+        month_start = (datetime.date(year, month, 1) - EPOCH).days
+        month_end = month_start + first_day.daysInMonth()
+        grid_start = (current_grid_date.toPyDate() - EPOCH).days
+        rollup = self.daily_stats
+        if rollup is not None and not rollup.empty:
+            month_durations = rollup['duration'][(rollup.index >= month_start) & (rollup.index < month_end)]
+            grid_stats = rollup[(rollup.index >= grid_start) & (rollup.index < grid_start + len(self.cells))].to_dict('index')
+        else: month_durations, grid_stats = [], {}
+        max_act = max(month_durations) if len(month_durations) else 3600
+        
         is_stacked = self.chk_stack.isChecked()
         
         for cell in self.cells:
             py_date = datetime.date(current_grid_date.year(), current_grid_date.month(), current_grid_date.day())
-            date_str = py_date.strftime('%Y-%m-%d')
-            stats = self.daily_stats.get(date_str, None)
+            stats = grid_stats.get((py_date - EPOCH).days, None)
             
             display_stats = None
             if stats:
@@ -341,7 +327,7 @@ class CalendarWidget(QWidget):
     def refresh_graph_only(self):
         if self.selected_date and self.full_df is not None:
             date_str = self.selected_date.strftime('%Y-%m-%d')
-            day_df = self.full_df[self.full_df['DateStr'] == date_str].copy()
+            day_df = self.state_manager.history.day(date_str).copy()
             self.activity_graph.load_data(day_df, self.chk_stack.isChecked())
 
     def prev_month(self): self.current_date = self.current_date.addMonths(-1); self.update_calendar()
@@ -353,7 +339,7 @@ class CalendarWidget(QWidget):
         
         if self.full_df is not None:
             date_str = py_date.strftime('%Y-%m-%d')
-            day_df = self.full_df[self.full_df['DateStr'] == date_str].copy()
+            day_df = self.state_manager.history.day(date_str).copy()
             
             self.detail_panel.load_day(date_str, day_df, self.full_df)
             self.activity_graph.load_data(day_df, self.chk_stack.isChecked())
\ No newline at end of file
@@ -73,7 +73,7 @@ class DailyActivityWidget(QWidget):
             
             # Since a run can be BOTH Scen PB and Sens PB, strict separation is tricky.
             # Simplified approach: Group by [Scenario, Sens], pick Max Score.
-            idx_to_keep = pbs.groupby(['Scenario', 'Sens'])['Score'].idxmax()
+            idx_to_keep = pbs.groupby(['Scenario', 'Sens'], observed=True)['Score'].idxmax()
             pbs = pbs.loc[idx_to_keep]
 
         for _, row in pbs.iterrows():
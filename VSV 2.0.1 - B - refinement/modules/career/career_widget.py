@@ -33,7 +33,7 @@ class CareerWidget(QWidget):
         self.full_df = df
         
         # Calculate Stats
-        stats = engine.calculate_profile_stats(df)
+        stats = engine.calculate_profile_stats(df, self.state_manager.history.combo_stats)
         self.render_view(stats)
 
     def render_view(self, stats):
@@ -65,13 +65,13 @@ class CareerWidget(QWidget):
         r_layout = QHBoxLayout(rank_frame)
         r_layout.setSpacing(10)
         
-        # Order: Transmute -> Singularity
-        rank_order = ["TRANSMUTE", "BLESSED", "EXALTED", "UBER", "ARCADIA", "SINGULARITY"]
-        colors = ["#448AFF", "#FF5252", "#FDD835", "#673AB7", "#2E7D32", "#000000"]
+        # Order: lowest tier -> highest (tiers are configurable, unknown names get a neutral card)
+        colors = {"TRANSMUTE": "#448AFF", "BLESSED": "#FF5252", "EXALTED": "#FDD835",
+                  "UBER": "#673AB7", "ARCADIA": "#2E7D32", "SINGULARITY": "#000000"}
         
-        for i, name in enumerate(rank_order):
-            count = stats['ranks'].get(name, 0)
-            self.add_rank_card(r_layout, name, count, colors[i])
+        for name in reversed(list(stats['ranks'])):
+            count = stats['ranks'][name]
+            self.add_rank_card(r_layout, name, count, colors.get(name, "#363a45"))
             
         self.content_layout.addWidget(rank_frame)
 
@@ -111,7 +111,7 @@ class CareerWidget(QWidget):
         lay = QVBoxLayout(frame)
         lay.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        txt_col = "white" if name in ["SINGULARITY", "UBER", "ARCADIA"] else "black"
+        txt_col = "black" if name in ["TRANSMUTE", "BLESSED", "EXALTED"] else "white"
         
         l1 = QLabel(name[:3]) # Short name
         l1.setStyleSheet(f"color: {txt_col}; font-size: 10px; font-weight: bold;")
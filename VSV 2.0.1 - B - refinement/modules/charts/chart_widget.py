@@ -18,6 +18,9 @@ COLORS_CYCLE_4 = [
     '#1f77b4', '#ff7f0e', '#9467bd', '#d62728'
 ]
 
+# Aggregate modes answered by HistoryStore.time_cube
+CUBE_MODES = {"Session Avg": 'session', "Daily Avg": 'day', "Weekly Avg": 'week', "Monthly Avg": 'month'}
+
 class DateAxis(pg.AxisItem):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -167,11 +170,12 @@ class ChartWidget(QWidget):
 
     def load_graph(self, scenario_name, sens_val):
         if self.all_runs_df is None: return
-        mask = self.all_runs_df['Scenario'] == scenario_name; df = self.all_runs_df[mask].copy()
-        if sens_val is not None: df = df[df['Sens'] == sens_val]; self.active_scenario_key = f"{scenario_name}_{sens_val}cm"; display_title = f"{scenario_name} ({sens_val}cm)"
-        else: self.active_scenario_key = scenario_name; display_title = f"{scenario_name} (All Sens)"
+        history = self.state_manager.history
+        if sens_val is not None: df = history.combo(scenario_name, sens_val).copy(); self.active_scenario_key = f"{scenario_name}_{sens_val}cm"; display_title = f"{scenario_name} ({sens_val}cm)"
+        else: df = history.scenario(scenario_name).copy(); self.active_scenario_key = scenario_name; display_title = f"{scenario_name} (All Sens)"
         if df.empty: self.plot_widget.clear(); self.state_manager.chart_title_changed.emit("No Data"); self.current_data_df = None; return
         df.sort_values('Timestamp', inplace=True); self.current_data_df = df; self.current_display_title = display_title
+        self.current_history = history; self.current_combo = (scenario_name, sens_val) # Rollup cube of the data on screen
         saved = self.config.get("chart_settings", scenario=self.active_scenario_key, default={}); val = saved.get("hide_low", 5.0)
         self.toolbar.sb_hide.blockSignals(True); self.toolbar.sb_hide.setValue(val); self.toolbar.sb_hide.blockSignals(False); self.reprocess_and_plot()
 
@@ -201,12 +205,17 @@ class ChartWidget(QWidget):
                 for sid, group in df.groupby('SessionID', sort=False): segments.append({'x': group['idx'].values, 'y': group['Score'].values, 'color': get_sess_color(int(sid))})
             else: segments.append({'x': x_all, 'y': y_all, 'color': '#2962FF'})
         else:
-            if mode == "Grouped Avg": n = self.toolbar.sb_group.value(); df['Group'] = np.arange(len(df)) // n; grouped = df.groupby('Group')
-            elif mode == "Session Avg": grouped = df.groupby('SessionID')
-            elif mode == "Daily Avg": grouped = df.groupby(pd.Grouper(key='Timestamp', freq='D'))
-            elif mode == "Weekly Avg": grouped = df.groupby(pd.Grouper(key='Timestamp', freq='W'))
-            elif mode == "Monthly Avg": grouped = df.groupby(pd.Grouper(key='Timestamp', freq='M'))
-            agg = grouped['Score'].mean().dropna(); agg_t = grouped['Timestamp'].max().dropna(); common = agg.index.intersection(agg_t.index); agg = agg.loc[common]; agg_t = agg_t.loc[common]
+            grain = CUBE_MODES.get(mode)
+            # The cube covers every run, so it only answers when the hide-low cutoff drops none of them
+            if grain and (cutoff <= 0 or self.current_data_df['Score'].min() >= cutoff):
+                rollup = self.current_history.period_rollup(grain, *self.current_combo); agg = rollup['sum'] / rollup['count']; agg_t = rollup['last']
+            else:
+                if mode == "Grouped Avg": n = self.toolbar.sb_group.value(); df['Group'] = np.arange(len(df)) // n; grouped = df.groupby('Group')
+                elif mode == "Session Avg": grouped = df.groupby('SessionID')
+                elif mode == "Daily Avg": grouped = df.groupby(pd.Grouper(key='Timestamp', freq='D'))
+                elif mode == "Weekly Avg": grouped = df.groupby(pd.Grouper(key='Timestamp', freq='W'))
+                elif mode == "Monthly Avg": grouped = df.groupby(pd.Grouper(key='Timestamp', freq='M'))
+                agg = grouped['Score'].mean().dropna(); agg_t = grouped['Timestamp'].max().dropna(); common = agg.index.intersection(agg_t.index); agg = agg.loc[common]; agg_t = agg_t.loc[common]
             y_vals = agg.values; x_vals = np.arange(len(y_vals));
             for i, ts in enumerate(agg_t.apply(lambda t: t.timestamp())): self.index_to_time_map[i] = ts
             segments.append({'x': x_vals, 'y': y_vals, 'color': '#FF9800'})
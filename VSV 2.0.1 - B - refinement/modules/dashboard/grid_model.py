@@ -0,0 +1,78 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import QStyledItemDelegate
+import numpy as np
+
+# Custom role: highlight color of a cell (QColor or None), painted by GridCellDelegate
+HighlightRole = Qt.ItemDataRole.UserRole + 1
+
+class GridTableModel(QAbstractTableModel):
+    """
+    Variant grid backed by NumPy arrays instead of one QTableWidgetItem per cell.
+    Column 0 is the row label, the rest read values[row, col - 1]; text and colors are
+    produced on demand when the view asks for them.
+    - values: float matrix, NaN = empty cell
+    - formats: per row, one format string per value column (e.g. "{:.0f}"); rows may share a list
+    - blanks: per row, text of NaN cells per value column
+    - colors: int matrix of indices into lut, same shape as values, negative = no color
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.row_labels = []
+        self.values = np.empty((0, 0))
+        self.formats = []
+        self.blanks = []
+        self.colors = None
+        self.lut = []
+
+    def set_grid(self, headers, row_labels, values, formats, blanks, colors=None, lut=None):
+        """Same shape and labels -> dataChanged only, otherwise a model reset"""
+        same_layout = (headers == self.headers and row_labels == self.row_labels)
+        if not same_layout: self.beginResetModel()
+        self.headers, self.row_labels = list(headers), list(row_labels)
+        self.values, self.formats, self.blanks, self.colors = values, formats, blanks, colors
+        if lut is not None: self.lut = lut
+        if not same_layout: self.endResetModel()
+        elif self.row_labels:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.row_labels) - 1, len(self.headers) - 1))
+
+    def clear(self): self.set_grid([], [], np.empty((0, 0)), [], [])
+
+    # --- QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.row_labels)
+
+    def columnCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal and section < len(self.headers):
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        r, c = index.row(), index.column()
+        if c == 0:
+            return self.row_labels[r] if role == Qt.ItemDataRole.DisplayRole else None
+        if role == Qt.ItemDataRole.DisplayRole:
+            val = self.values[r, c - 1]
+            return self.blanks[r][c - 1] if np.isnan(val) else self.formats[r][c - 1].format(val)
+        if role == Qt.ItemDataRole.TextAlignmentRole: return Qt.AlignmentFlag.AlignCenter
+        if role == HighlightRole: return self.cell_color(r, c - 1)
+        return None
+
+    def cell_color(self, row, col):
+        if self.colors is None: return None
+        idx = self.colors[row, col]
+        return self.lut[idx] if idx >= 0 else None
+
+    # --- LOOKUPS (replace QTableWidget.item(...).text()) ---
+    def row_label(self, row): return self.row_labels[row] if 0 <= row < len(self.row_labels) else None
+
+    def header(self, col): return self.headers[col] if 0 <= col < len(self.headers) else None
+
+class GridCellDelegate(QStyledItemDelegate):
+    """Fills the highlight color, then lets the default delegate draw text / selection"""
+    def paint(self, painter, option, index):
+        color = index.data(HighlightRole)
+        if color is not None: painter.fillRect(option.rect, color)
+        super().paint(painter, option, index)
@@ -1,15 +1,16 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTableView, 
                              QHeaderView, QLabel, QFrame, QHBoxLayout, 
                              QAbstractItemView, QComboBox, QRadioButton, 
                              QCheckBox, QButtonGroup, QMenu, QDialog, QListWidget, QPushButton)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QAction, QColor, QCursor
+from PyQt6.QtGui import QAction, QCursor
 import pandas as pd
 import numpy as np
 import re
 from core.analytics import parsers, stats
 from modules.dashboard import strategies
 from modules.dashboard.tooltip import CustomTooltip
+from modules.dashboard.grid_model import GridTableModel, GridCellDelegate
 
 class ManageHiddenDialog(QDialog):
     def __init__(self, hidden_scens, hidden_cms, parent=None):
@@ -60,6 +61,11 @@ class GridWidget(QWidget):
         self.base_scenario_name = ""
         self.is_loading_state = False
         self.recent_data_map = {}
+        # Memo of filtered rows (per family / filter state) and summaries (+ mode / setting),
+        # dropped whenever the history version changes
+        self.filter_cache = {}
+        self.summary_cache = {}
+        self.cache_version = None
         
         self.agg_strategies = {cls.name: cls() for cls in strategies.AGGREGATION_MODES}
         self.hl_strategies = {cls.name: cls() for cls in strategies.HIGHLIGHT_MODES}
@@ -149,13 +155,17 @@ class GridWidget(QWidget):
         layout.addWidget(self.row4)
 
         # ROW 5
-        self.grid = QTableWidget()
+        # Model/view: cells are painted from the model's arrays, no per-cell items
+        self.grid = QTableView()
+        self.grid_model = GridTableModel(self)
+        self.grid.setModel(self.grid_model)
+        self.grid.setItemDelegate(GridCellDelegate(self.grid))
         self.grid.verticalHeader().setVisible(False)
         self.grid.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.grid.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.grid.cellClicked.connect(self.on_cell_clicked)
+        self.grid.clicked.connect(self.on_cell_clicked)
         self.grid.setMouseTracking(True)
-        self.grid.cellEntered.connect(self.on_cell_entered)
+        self.grid.entered.connect(self.on_cell_entered)
         
         self.grid.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.grid.customContextMenuRequested.connect(self.on_table_context_menu)
@@ -200,6 +210,7 @@ class GridWidget(QWidget):
             family_df = self.all_runs_df[self.all_runs_df['Scenario'] == scenario_name].copy()
             family_df['Modifiers'] = [{}] * len(family_df)
         self.current_family_df = family_df
+        self.filter_cache, self.summary_cache = {}, {}
 
         # 3. Populate Axes
         axes = set()
@@ -385,6 +396,57 @@ class GridWidget(QWidget):
 
     def refresh_grid_view(self):
         if self.current_family_df is None: return
+        history = self.state_manager.history
+        if self.cache_version != history.version:
+            self.filter_cache, self.summary_cache, self.cache_version = {}, {}, history.version
+
+        active_formats = {pat: chk.isChecked() for pat, chk in self.format_checkboxes.items()}
+        filter_key = (self.base_scenario_name, self.current_axis, frozenset(self.hidden_scenarios),
+                      tuple(sorted(active_formats.items())))
+        setting_val = None
+        if self.agg_setting_widget:
+            setting_val = self.active_agg.get_setting_value(self.agg_setting_widget)
+
+        summary_key = (filter_key, self.active_agg.name, setting_val)
+        if summary_key not in self.summary_cache:
+            self.summary_cache[summary_key] = self.summarize_family(filter_key, active_formats, setting_val)
+        summary = self.summary_cache[summary_key]
+        if summary is None: self.grid_model.clear(); return
+        pivot = summary.pivot_table(index='Scenario', columns='Sens', values='Score', observed=True)
+        
+        sens_filter = self.sens_combo.currentText()
+        step = 0
+        if sens_filter != "All":
+            try: step = float(sens_filter.replace("cm", ""))
+            except: pass
+            
+        cols = []
+        for c in pivot.columns:
+            if str(c) in self.hidden_cms or f"{c}cm" in self.hidden_cms: continue
+            if step > 0:
+                if self._is_step_match(c, step): cols.append(c)
+            else:
+                cols.append(c)
+                
+        pivot = pivot[cols]
+        pivot = self.sort_pivot_rows(pivot)
+
+        self.recent_data_map = {}
+        if self.active_hl.name == "Recent Success":
+            days = 14
+            if self.hl_setting_widget:
+                days = self.active_hl.get_setting_value(self.hl_setting_widget)
+            
+            cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
+            recent_df = self.current_family_df[self.current_family_df['Timestamp'] >= cutoff]
+            if not recent_df.empty:
+                self.recent_data_map = recent_df.groupby(['Scenario', 'Sens'], observed=True)['Score'].max().to_dict()
+
+        self.populate_table(pivot)
+
+
+    def filter_family_rows(self, active_formats):
+        """Family rows on the current axis that pass the hidden / format filters, None if empty"""
         df = self.current_family_df.copy()
         
         # Optimization: List of dicts
@@ -393,7 +455,6 @@ class GridWidget(QWidget):
         base_name = self.base_scenario_name
         curr_axis = self.current_axis
         
-        active_formats = {pat: chk.isChecked() for pat, chk in self.format_checkboxes.items()}
         hidden_scens = self.hidden_scenarios
 
         filtered_rows = []
@@ -420,7 +481,7 @@ class GridWidget(QWidget):
                     else:
                         filtered_rows.append(row)
 
-        if not filtered_rows: self.grid.clear(); return
+        if not filtered_rows: return None
         filtered_df = pd.DataFrame(filtered_rows)
         
         # ... (Rest of function remains exactly the same from "Prepare ActiveAxis" onwards)
@@ -431,43 +492,26 @@ class GridWidget(QWidget):
             filtered_df['ActiveAxis'] = filtered_df['Modifiers'].apply(
                 lambda m: m[self.current_axis][0] if self.current_axis in m else np.nan)
 
-        setting_val = None
-        if self.agg_setting_widget:
-            setting_val = self.active_agg.get_setting_value(self.agg_setting_widget)
-        
-        summary = self.active_agg.calculate(filtered_df, setting_val)
-        pivot = summary.pivot_table(index='Scenario', columns='Sens', values='Score')
-
-        sens_filter = self.sens_combo.currentText()
-        step = 0
-        if sens_filter != "All":
-            try: step = float(sens_filter.replace("cm", ""))
-            except: pass
-            
-        cols = []
-        for c in pivot.columns:
-            if str(c) in self.hidden_cms or f"{c}cm" in self.hidden_cms: continue
-            if step > 0:
-                if self._is_step_match(c, step): cols.append(c)
-            else:
-                cols.append(c)
-                
-        pivot = pivot[cols]
-        pivot = self.sort_pivot_rows(pivot)
-
-        self.recent_data_map = {}
-        if self.active_hl.name == "Recent Success":
-            days = 14
-            if self.hl_setting_widget:
-                days = self.active_hl.get_setting_value(self.hl_setting_widget)
-            
-            cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
-            recent_df = self.current_family_df[self.current_family_df['Timestamp'] >= cutoff]
-            if not recent_df.empty:
-                self.recent_data_map = recent_df.groupby(['Scenario', 'Sens'])['Score'].max().to_dict()
-
-        self.populate_table(pivot)
-
+        return filtered_df
+
+    def summarize_family(self, filter_key, active_formats, setting_val):
+        """Aggregated (Scenario, Sens, Score) frame of the filtered family, None if nothing is left"""
+        if filter_key not in self.filter_cache:
+            filtered_df = self.filter_family_rows(active_formats)
+            self.filter_cache[filter_key] = (filtered_df, None)
+        filtered_df, ranked = self.filter_cache[filter_key]
+        if filtered_df is None: return None
+
+        # Rows are filtered per whole scenario, so the shared per-combo aggregates apply as-is
+        summary = self.active_agg.from_shared(self.state_manager.history.combo_stats, set(filtered_df['Scenario']), setting_val)
+        if summary is None:
+            # One sort per filter state serves every rank / percentile setting
+            if ranked is None:
+                ranked = strategies.RankedScores(filtered_df)
+                self.filter_cache[filter_key] = (filtered_df, ranked)
+            summary = self.active_agg.from_ranked(ranked, setting_val)
+        if summary is None: summary = self.active_agg.calculate(filtered_df, setting_val)
+        return summary
 
     def _is_step_match(self, col, step):
         try:
@@ -486,127 +530,68 @@ class GridWidget(QWidget):
         return pivot_df.reindex(rows)
 
     def populate_table(self, df):
-        self.grid.clear()
         cols = sorted(df.columns, key=lambda x: float(x) if str(x).replace('.','').isdigit() else str(x))
         headers = ["Scenario"] + [f"{c}cm" for c in cols] + ["AVG", "Best", "%"]
-        
-        self.grid.setRowCount(len(df) + 1)
-        self.grid.setColumnCount(len(headers))
-        self.grid.setHorizontalHeaderLabels(headers)
-        
-        header = self.grid.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        if len(headers) > 1:
-            for i in range(1, len(headers)):
-                header.setSectionResizeMode(i, QHeaderView.ResizeMode.Stretch)
-
-        avg_vals = {c: df[c].mean() for c in cols}
-        
-        # ROW 0
-        self.grid.setItem(0,0, QTableWidgetItem("-- Average --"))
-        row_means_list = []
-        for i, c in enumerate(cols):
-            val = avg_vals.get(c, np.nan)
-            if pd.notna(val):
-                row_means_list.append(val)
-                it = QTableWidgetItem(f"{val:.1f}")
-                it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                it.setBackground(QColor(40,44,52))
-                self.grid.setItem(0, i+1, it)
-        
-        if row_means_list:
-            it_avg = QTableWidgetItem(f"{np.mean(row_means_list):.1f}")
-            it_avg.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.grid.setItem(0, len(cols)+1, it_avg)
-            
-            it_max = QTableWidgetItem(f"{np.max(row_means_list):.1f}")
-            it_max.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.grid.setItem(0, len(cols)+2, it_max)
+        n_cols = len(cols)
+        data = df[cols].to_numpy(dtype=float)
+
+        # ROW 0: column averages, then AVG / Best of those
+        avg_vals = df[cols].mean().to_numpy()
+        has_avg = avg_vals[~np.isnan(avg_vals)]
+        avg_row = np.concatenate([avg_vals, [has_avg.mean(), has_avg.max(), np.nan] if len(has_avg) else [np.nan] * 3])
+
+        # DATA: per row AVG / Best / % of the base scenario's best
+        row_mean = df[cols].mean(axis=1).to_numpy()
+        row_max = df[cols].max(axis=1).to_numpy()
+        base_pb = df.loc[self.base_scenario_name, cols].max() if self.base_scenario_name in df.index else 1.0
+        pct = np.where(np.isnan(row_max), np.nan, (row_max / base_pb * 100) if base_pb > 0 else 0.0)
+        values = np.vstack([avg_row, np.column_stack([data, row_mean, row_max, pct])])
+
+        avg_formats = ["{:.1f}"] * n_cols + ["{:.1f}", "{:.1f}", "{:.0f}%"]
+        data_formats = ["{:.0f}"] * n_cols + ["{:.1f}", "{:.0f}", "{:.0f}%"]
+        data_blanks = ["-"] * n_cols + [""] * 3
+        formats = [avg_formats] + [data_formats] * len(df)
+        blanks = [[""] * (n_cols + 3)] + [data_blanks] * len(df)
 
         # Settings for Highlight
         hl_setting = None
         if self.hl_setting_widget:
             hl_setting = self.active_hl.get_setting_value(self.hl_setting_widget)
 
-        # DATA
-        row_idx = 1
-        for sc, row in df.iterrows():
-            self.grid.setItem(row_idx, 0, QTableWidgetItem(str(sc)))
-            vals = row.dropna().values
-            if len(vals) == 0:
-                for i, c in enumerate(cols): self.grid.setItem(row_idx, i+1, QTableWidgetItem("-"))
-                row_idx += 1
-                continue
+        # Highlight context as whole matrices: value shown one row up, recent best per cell
+        prev = np.full_like(data, np.nan)
+        prev[1:] = np.round(data[:-1])
+        recent = np.full_like(data, np.nan)
+        if self.recent_data_map:
+            recent[:] = [[self.recent_data_map.get((sc, c), np.nan) for c in cols] for sc in df.index]
 
-            # Context for Coloring
-            # Ensure we handle empty dataframe gracefully for global stats
-            g_vals = df.values.flatten()
-            g_vals = g_vals[~np.isnan(g_vals)]
-            
-            ctx = {
-                'r_min': vals.min(), 'r_max': vals.max(),
-                'g_min': g_vals.min() if len(g_vals) > 0 else 0,
-                'g_max': g_vals.max() if len(g_vals) > 0 else 1
-            }
-
-            for i, c in enumerate(cols):
-                val = row.get(c, np.nan)
-                if pd.notna(val):
-                    it = QTableWidgetItem(f"{val:.0f}")
-                    it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    
-                   # Logic for Performance Drop (prev_val)
-                    # FIX: Only compare if NOT the first data row (row_idx 1 is first data row)
-                    if row_idx > 1:
-                        prev_item = self.grid.item(row_idx-1, i+1)
-                        if prev_item and prev_item.text() != "-" and prev_item.text():
-                            try: ctx['prev_val'] = float(prev_item.text())
-                            except: ctx['prev_val'] = None
-                        else: ctx['prev_val'] = None
-                    else:
-                        ctx['prev_val'] = None # No comparison for top row
+        colors = np.full(values.shape, strategies.NO_COLOR, dtype=np.int16)
+        colors[0, :n_cols][~np.isnan(avg_vals)] = strategies.AVG_ROW
+        colors[1:, :n_cols] = self.active_hl.color_indices(data, {'prev': prev, 'recent_max': recent}, hl_setting)
 
-                    # APPLY COLOR
-                    col = self.active_hl.get_color(val, ctx, hl_setting)
-                    if col: it.setBackground(col)
-                    
-                    self.grid.setItem(row_idx, i+1, it)
-                else:
-                    self.grid.setItem(row_idx, i+1, QTableWidgetItem("-"))
-            
-            it_mean = QTableWidgetItem(f"{vals.mean():.1f}")
-            it_mean.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.grid.setItem(row_idx, len(cols)+1, it_mean)
-            
-            it_best = QTableWidgetItem(f"{vals.max():.0f}")
-            it_best.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.grid.setItem(row_idx, len(cols)+2, it_best)
-            
-            base_pb = 1.0
-            if self.base_scenario_name in df.index: base_pb = df.loc[self.base_scenario_name].max()
-            pct = (vals.max()/base_pb*100) if base_pb>0 else 0
-            
-            it_pct = QTableWidgetItem(f"{pct:.0f}%")
-            it_pct.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.grid.setItem(row_idx, len(cols)+3, it_pct)
-            
-            row_idx += 1
+        self.grid_model.set_grid(headers, ["-- Average --"] + [str(sc) for sc in df.index], values, formats, blanks, colors, strategies.COLOR_LUT)
+
+        header = self.grid.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        for i in range(1, len(headers)):
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.Stretch)
 
     # ... Context Menu handlers remain same ...
     def on_table_context_menu(self, pos):
-        item = self.grid.itemAt(pos)
-        if not item: return
-        if item.column() != 0: return 
+        index = self.grid.indexAt(pos)
+        if not index.isValid(): return
+        if index.column() != 0: return 
+        name = self.grid_model.row_label(index.row())
         menu = QMenu(self)
-        hide_action = QAction(f"Hide Scenario: {item.text()}", self)
-        hide_action.triggered.connect(lambda: self.hide_scenario(item.text()))
+        hide_action = QAction(f"Hide Scenario: {name}", self)
+        hide_action.triggered.connect(lambda: self.hide_scenario(name))
         menu.addAction(hide_action)
         menu.exec(self.grid.viewport().mapToGlobal(pos))
 
     def on_header_context_menu(self, pos):
         idx = self.grid.horizontalHeader().logicalIndexAt(pos)
         if idx <= 0: return 
-        header_text = self.grid.horizontalHeaderItem(idx).text()
+        header_text = self.grid_model.header(idx)
         if header_text in ["AVG", "Best", "%", "cm"]: return
         menu = QMenu(self)
         hide_action = QAction(f"Hide {header_text}", self)
@@ -632,16 +617,16 @@ class GridWidget(QWidget):
         self.save_view_settings()
         self.refresh_grid_view()
 
-    def on_cell_clicked(self, r, c):
-        item_scen = self.grid.item(r, 0)
-        if not item_scen or item_scen.text() == "-- Average --": return
+    def on_cell_clicked(self, index):
+        r, c = index.row(), index.column()
+        scenario_name = self.grid_model.row_label(r)
+        if not scenario_name or scenario_name == "-- Average --": return
         
-        scenario_name = item_scen.text()
         sens_val = None
         
         # If clicked column > 0, try to find sensitivity
         if c > 0:
-            header_text = self.grid.horizontalHeaderItem(c).text()
+            header_text = self.grid_model.header(c)
             # Ignore aggregate columns like AVG, Best, %
             if header_text not in ["AVG", "Best", "%"]:
                 try:
@@ -655,32 +640,32 @@ class GridWidget(QWidget):
             'sens': sens_val
         })
 
-    def on_cell_entered(self, row, col):
+    def on_cell_entered(self, index):
+        row, col = index.row(), index.column()
         if row < 0 or col < 0: self.tooltip.hide(); return
         
-        item_scen = self.grid.item(row, 0)
-        if not item_scen: self.tooltip.hide(); return
-        
-        scenario_name = item_scen.text()
+        scenario_name = self.grid_model.row_label(row)
+        if not scenario_name: self.tooltip.hide(); return
         if scenario_name == "-- Average --": self.tooltip.hide(); return
         
         # Get Sens
         sens_val = None
-        sens_str = self.grid.horizontalHeaderItem(col).text().replace("cm", "")
+        sens_str = self.grid_model.header(col).replace("cm", "")
         if col > 0:
             try: sens_val = float(sens_str)
             except: pass
             
         if self.current_family_df is None: return
         
-        # Filter DF
-        df = self.current_family_df[self.current_family_df['Scenario'] == scenario_name]
+        # Indexed lookup (no scan of the family frame)
+        history = self.state_manager.history
         if sens_val is not None:
-            df = df[df['Sens'] == sens_val]
+            df = history.combo(scenario_name, sens_val)
             sub_title = f"Sensitivity: {sens_val}cm"
         else:
             if col == 0: sub_title = "Sensitivity: All"
             else: self.tooltip.hide(); return # Empty cell area
+            df = history.scenario(scenario_name)
             
         if df.empty: self.tooltip.hide(); return
         
@@ -1,7 +1,6 @@
 from PyQt6.QtWidgets import QSpinBox, QDoubleSpinBox, QWidget, QHBoxLayout, QLabel
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
-import pandas as pd
 import numpy as np
 
 # --- BASE CLASSES ---
@@ -14,9 +13,28 @@ class StrategyBase:
 
 class AggregationMode(StrategyBase):
     def calculate(self, df, setting_val): pass
+    # Column of HistoryStore.combo_stats that answers this mode, or None (-> calculate)
+    def shared_column(self, setting_val): return None
+
+    def from_shared(self, combo_stats, scenarios, setting_val):
+        """Same frame as calculate(), read from the shared aggregates of whole scenarios"""
+        col = self.shared_column(setting_val)
+        if col is None: return None
+        out = combo_stats[col].rename('Score').reset_index()
+        return out[out['Scenario'].isin(scenarios)].reset_index(drop=True)
+
+    def from_ranked(self, ranked, setting_val):
+        """Same frame as calculate(), read from a RankedScores of the same rows, or None"""
+        return None
 
 class HighlightMode(StrategyBase):
-    def get_color(self, val, ctx, setting_val): pass
+    def color_indices(self, values, ctx, setting_val):
+        """
+        Whole-grid highlight in one pass. values: pivot matrix (NaN = empty cell).
+        ctx: 'prev' (value shown one row up) and 'recent_max', both matrices shaped like values, NaN = none.
+        Returns an int matrix of COLOR_LUT indices, NO_COLOR = no highlight.
+        """
+        return np.full(values.shape, NO_COLOR, dtype=np.int16)
 
 # --- 1. AGGREGATION MODES ---
 
@@ -31,25 +49,27 @@ class ModePB(AggregationMode):
     def get_setting_value(self, w): return w.value()
     def set_setting_value(self, w, v): w.setValue(v)
 
+    def shared_column(self, rank): return 'max' if not rank or rank == 1 else None
+
+    def from_ranked(self, ranked, rank): return ranked.frame(ranked.nth_best(rank if rank else 1))
+
     def calculate(self, df, rank):
         rank = rank if rank else 1
-        grouper = ['Scenario', 'Sens']
-        
         if rank == 1:
-            return df.groupby(grouper)['Score'].max().reset_index()
-        
-        def get_nth(g): return g.nlargest(rank).iloc[-1] if len(g) >= rank else np.nan
-        return df.groupby(grouper)['Score'].apply(get_nth).reset_index()
+            return df.groupby(['Scenario', 'Sens'], observed=True)['Score'].max().reset_index()
+        return self.from_ranked(RankedScores(df), rank)
 
 class ModeAvg(AggregationMode):
     name = "Average Score"
+    def shared_column(self, val): return 'mean'
     def calculate(self, df, val):
-        return df.groupby(['Scenario', 'Sens'])['Score'].mean().reset_index()
+        return df.groupby(['Scenario', 'Sens'], observed=True)['Score'].mean().reset_index()
 
 class ModeCount(AggregationMode):
     name = "Play Count"
+    def shared_column(self, val): return 'count'
     def calculate(self, df, val):
-        return df.groupby(['Scenario', 'Sens'])['Score'].size().reset_index()
+        return df.groupby(['Scenario', 'Sens'], observed=True)['Score'].size().reset_index()
 
 class ModePercentile(AggregationMode):
     name = "Nth Percentile"
@@ -59,35 +79,65 @@ class ModePercentile(AggregationMode):
     def get_setting_value(self, w): return w.value()
     def set_setting_value(self, w, v): w.setValue(v)
 
-    def calculate(self, df, p):
-        p = (p / 100.0) if p else 0.75
-        return df.groupby(['Scenario', 'Sens'])['Score'].quantile(p).reset_index()
+    def shared_column(self, p): return 'p75' if not p or p == 75 else None
+
+    def from_ranked(self, ranked, p): return ranked.frame(ranked.quantile((p / 100.0) if p else 0.75))
+
+    def calculate(self, df, p): return self.from_ranked(RankedScores(df), p)
+
+class RankedScores:
+    """
+    Scores sorted once by (Scenario, Sens, -Score), so every combo is a contiguous descending run.
+    Nth best and any percentile are then plain index lookups, shared by every rank / setting.
+    """
+    def __init__(self, df):
+        s = df[['Scenario', 'Sens', 'Score']].dropna()
+        s = s.sort_values(['Scenario', 'Sens', 'Score'], ascending=[True, True, False], kind='stable')
+        pos = s.groupby(['Scenario', 'Sens'], observed=True, sort=False).cumcount().to_numpy()
+        self.scores = s['Score'].to_numpy(dtype=float)
+        self.starts = np.flatnonzero(pos == 0)
+        self.sizes = np.diff(np.append(self.starts, len(pos)))
+        self.keys = s[['Scenario', 'Sens']].iloc[self.starts].reset_index(drop=True)
+
+    def frame(self, values): return self.keys.assign(Score=values)
+
+    def nth_best(self, rank):
+        """rank-th highest score per combo, NaN if the combo has fewer runs"""
+        out = np.full(len(self.starts), np.nan)
+        has = self.sizes >= rank
+        out[has] = self.scores[self.starts[has] + rank - 1]
+        return out
+
+    def quantile(self, q):
+        """Linear-interpolated quantile per combo (same as pandas' default)"""
+        if len(self.starts) == 0: return np.empty(0)
+        pos = q * (self.sizes - 1)
+        lo, hi = np.floor(pos).astype(int), np.ceil(pos).astype(int)
+        # Ascending index i sits at start + size - 1 - i in the descending runs
+        last = self.starts + self.sizes - 1
+        v_lo, v_hi = self.scores[last - lo], self.scores[last - hi]
+        return v_lo + (v_hi - v_lo) * (pos - lo)
 
 # --- 2. HIGHLIGHT MODES ---
 
 class HLRowHeatmap(HighlightMode):
     name = "Row Heatmap"
-    def get_color(self, val, ctx, setting):
-        r_min, r_max = ctx['r_min'], ctx['r_max']
-        if r_max <= r_min: return None
-        ratio = (val - r_min)/(r_max - r_min)
-        return get_traffic_light_color(ratio)
+    def color_indices(self, values, ctx, setting):
+        r_min = np.fmin.reduce(values, axis=1, initial=np.inf, keepdims=True)
+        r_max = np.fmax.reduce(values, axis=1, initial=-np.inf, keepdims=True)
+        return heatmap_indices(values, r_min, r_max)
 
 class HLGlobalHeatmap(HighlightMode):
     name = "Global Heatmap"
-    def get_color(self, val, ctx, setting):
-        g_min, g_max = ctx['g_min'], ctx['g_max']
-        if g_max <= g_min: return None
-        ratio = (val - g_min)/(g_max - g_min)
-        return get_traffic_light_color(ratio)
+    def color_indices(self, values, ctx, setting):
+        present = values[~np.isnan(values)]
+        if len(present) == 0: return super().color_indices(values, ctx, setting)
+        return heatmap_indices(values, present.min(), present.max())
 
 class HLDrop(HighlightMode):
     name = "Performance Drop"
-    def get_color(self, val, ctx, setting):
-        if ctx.get('prev_val') is not None:
-            if val < ctx['prev_val']:
-                return QColor(89, 32, 32) # Dark Red
-        return None
+    def color_indices(self, values, ctx, setting):
+        return pick_colors(values, values < ctx['prev'], DROP_RED, NO_COLOR) # Dark Red
 
 class HLTarget(HighlightMode):
     name = "Target Score"
@@ -109,11 +159,10 @@ class HLTarget(HighlightMode):
     def get_setting_value(self, w): return w.spin.value()
     def set_setting_value(self, w, v): w.spin.setValue(v)
 
-    def get_color(self, val, ctx, target):
+    def color_indices(self, values, ctx, target):
         if not target: target = 1000
         # FIX: Binary logic
-        if val >= target: return QColor(46, 105, 49) # Green
-        else: return QColor(83, 31, 31) # Red
+        return pick_colors(values, values >= target, GOOD_GREEN, BAD_RED)
     
 class HLRecent(HighlightMode):
     name = "Recent Success"
@@ -139,30 +188,42 @@ class HLRecent(HighlightMode):
         except:
             w.spin.setValue(1000) # Fallback to default if corrupted
 
-    def get_color(self, val, ctx, setting):
-        recent = ctx.get('recent_max')
-        if recent is None or pd.isna(recent): return None
-        if recent >= val: return QColor(46, 105, 49)
-        else: return QColor(83, 31, 31)
+    def color_indices(self, values, ctx, setting):
+        recent = ctx['recent_max']
+        colors = pick_colors(values, recent >= values, GOOD_GREEN, BAD_RED)
+        colors[np.isnan(recent)] = NO_COLOR
+        return colors
 
 class HLNone(HighlightMode):
     name = "None"
-    def get_color(self, val, ctx, setting): return None
 
 # --- UTILS ---
 def get_traffic_light_color(ratio):
     ratio = max(0.0, min(1.0, ratio))
-    c_red = np.array([120, 47, 47])
-    c_yel = np.array([122, 118, 50])
-    c_grn = np.array([54, 107, 54])
-    
-    if ratio < 0.5:
-        local_r = ratio * 2
-        res = (1 - local_r) * c_red + local_r * c_yel
-    else:
-        local_r = (ratio - 0.5) * 2
-        res = (1 - local_r) * c_yel + local_r * c_grn
-    return QColor(int(res[0]), int(res[1]), int(res[2]))
+    c_red, c_yel, c_grn = (120, 47, 47), (122, 118, 50), (54, 107, 54)
+    if ratio < 0.5: lo, hi, local_r = c_red, c_yel, ratio * 2
+    else: lo, hi, local_r = c_yel, c_grn, (ratio - 0.5) * 2
+    return QColor(*(int((1 - local_r) * a + local_r * b) for a, b in zip(lo, hi)))
+
+# --- COLOR LUT ---
+# Highlight strategies return indices into this table; the grid looks colors up when painting.
+# 0..HEATMAP_STEPS-1 is the traffic light gradient, then the fixed highlight colors.
+HEATMAP_STEPS = 256
+NO_COLOR = -1
+COLOR_LUT = [get_traffic_light_color(i / (HEATMAP_STEPS - 1)) for i in range(HEATMAP_STEPS)]
+DROP_RED, GOOD_GREEN, BAD_RED, AVG_ROW = range(HEATMAP_STEPS, HEATMAP_STEPS + 4)
+COLOR_LUT += [QColor(89, 32, 32), QColor(46, 105, 49), QColor(83, 31, 31), QColor(40, 44, 52)]
+
+def heatmap_indices(values, lo, hi):
+    """Gradient index of each cell between lo and hi (scalars or broadcastable); none if hi <= lo"""
+    span = hi - lo
+    with np.errstate(invalid='ignore', divide='ignore'):
+        steps = np.rint(np.clip((values - lo) / span, 0.0, 1.0) * (HEATMAP_STEPS - 1))
+    return np.where(~np.isnan(values) & (span > 0), steps, NO_COLOR).astype(np.int16)
+
+def pick_colors(values, mask, yes, no):
+    """yes where mask, no elsewhere, NO_COLOR on empty cells"""
+    return np.where(np.isnan(values), NO_COLOR, np.where(mask, yes, no)).astype(np.int16)
 
 AGGREGATION_MODES = [ModePB, ModePercentile, ModeAvg, ModeCount]
 HIGHLIGHT_MODES = [HLRowHeatmap, HLGlobalHeatmap, HLDrop, HLTarget, HLRecent, HLNone]
\ No newline at end of file
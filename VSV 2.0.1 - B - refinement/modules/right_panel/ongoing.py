@@ -113,10 +113,10 @@ class OngoingWidget(QWidget):
         if df is None: return
         self.full_df = df
         
-        grouped = df.groupby(['Scenario', 'Sens'])['Score']
-        self.stats_cache_avg = grouped.mean().to_dict()
-        self.stats_cache_75 = grouped.quantile(0.75).to_dict()
-        self.stats_cache_pb = grouped.max().to_dict()
+        aggs = self.state_manager.history.combo_stats
+        self.stats_cache_avg = aggs['mean'].to_dict()
+        self.stats_cache_75 = aggs['p75'].to_dict()
+        self.stats_cache_pb = aggs['max'].to_dict()
         
         # Get Last 50 Runs
         self.recent_runs = df.sort_values('Timestamp', ascending=False).head(50)
@@ -1,8 +1,20 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem, 
-                             QLabel, QFrame)
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, 
+                             QLabel, QFrame, QComboBox, QDateEdit, QPushButton)
+from PyQt6.QtCore import Qt, QDate
 import pandas as pd
 
+RANGE_PERIODS = ["Week", "Month", "3 Months"]
+
+def period_bounds(period, day):
+    """Calendar aligned [start, end) of the period containing day"""
+    day = pd.Timestamp(day).normalize()
+    if period == "Week":
+        start = day - pd.Timedelta(days=day.weekday())
+        return start, start + pd.Timedelta(days=7)
+    month = day.replace(day=1)
+    start = month - pd.DateOffset(months=2) if period == "3 Months" else month
+    return start, month + pd.DateOffset(months=1)
+
 class SessionListWidget(QWidget):
     def __init__(self, state_manager):
         super().__init__()
@@ -12,6 +24,7 @@ class SessionListWidget(QWidget):
         self.setup_ui()
         
         self.state_manager.data_updated.connect(self.on_data_updated)
+        self.state_manager.sessions_relabelled.connect(self.on_data_updated)
         self.state_manager.session_selected.connect(self.on_external_selection)
 
     def setup_ui(self):
@@ -22,6 +35,20 @@ class SessionListWidget(QWidget):
         lbl.setStyleSheet("font-weight: bold; padding: 10px;")
         layout.addWidget(lbl)
 
+        # Range report: week / month / 3 months containing the chosen day
+        range_bar = QHBoxLayout()
+        range_bar.setContentsMargins(10, 0, 10, 5)
+        self.cb_period = QComboBox()
+        self.cb_period.addItems(RANGE_PERIODS)
+        self.date_edit = QDateEdit(QDate.currentDate())
+        self.date_edit.setCalendarPopup(True)
+        btn_report = QPushButton("Report")
+        btn_report.clicked.connect(self.on_range_report)
+        range_bar.addWidget(self.cb_period)
+        range_bar.addWidget(self.date_edit, stretch=1)
+        range_bar.addWidget(btn_report)
+        layout.addLayout(range_bar)
+
         self.list_widget = QListWidget()
         self.list_widget.setStyleSheet("border: none;")
         self.list_widget.itemClicked.connect(self.on_item_clicked)
@@ -84,6 +111,11 @@ class SessionListWidget(QWidget):
             # Emit signal so views populate for the first time
             self.state_manager.session_selected.emit(new_id)
 
+    def on_range_report(self):
+        start, end = period_bounds(self.cb_period.currentText(), self.date_edit.date().toPyDate())
+        self.list_widget.clearSelection()
+        self.state_manager.range_selected.emit(start, end)
+
     def on_item_clicked(self, item):
         sess_id = item.data(Qt.ItemDataRole.UserRole)
         self.current_selected_id = sess_id
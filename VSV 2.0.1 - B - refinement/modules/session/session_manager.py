@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QStackedWidget, QPushButton, 
                              QHBoxLayout, QLabel, QFrame, QCheckBox)
 from PyQt6.QtCore import Qt
+import pandas as pd
 from core.config_manager import ConfigManager
 from modules.session.session_list import SessionListWidget
 from modules.session.session_report import SessionReportWidget
@@ -56,6 +57,7 @@ class SessionManager(QWidget):
         
         self.page_list = SessionListWidget(state_manager)
         self.state_manager.session_selected.connect(self.go_to_report)
+        self.state_manager.range_selected.connect(self.go_to_range_report)
         
         self.page_report = SessionReportWidget(state_manager)
         
@@ -74,10 +76,17 @@ class SessionManager(QWidget):
         self.page_report.set_stack_mode(val)
 
     def go_to_report(self, session_id):
+        self.show_report_page(f"Session #{int(session_id)}")
+
+    def go_to_range_report(self, start, end):
+        last_day = end - pd.Timedelta(days=1)
+        self.show_report_page(f"{start.strftime('%b %d')} - {last_day.strftime('%b %d, %Y')}")
+
+    def show_report_page(self, title):
         self.stack.setCurrentWidget(self.page_report)
         self.btn_back.setVisible(True)
         self.chk_stack.setVisible(True)
-        self.lbl_title.setText(f"Session #{int(session_id)}")
+        self.lbl_title.setText(title)
         
         # Ensure report has correct stack mode
         self.page_report.set_stack_mode(self.chk_stack.isChecked())
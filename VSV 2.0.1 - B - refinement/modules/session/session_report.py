@@ -5,7 +5,6 @@ from PyQt6.QtGui import QColor
 import pandas as pd
 import numpy as np
 from collections import defaultdict
-from core.analytics import stats as engine
 from modules.charts.chart_widget import ChartWidget, COLORS_CYCLE_10
 
 class SessionToolbar(QFrame):
@@ -59,12 +58,15 @@ class SessionReportWidget(QWidget):
         self.full_df = None
         self.summary = None
         self.current_session_id = None
+        self.current_range = None # (start, end) while showing a multi-session report
         self.stack_pbs = False 
         
         self.setup_ui()
         
         self.state_manager.data_updated.connect(self.on_data_updated)
+        self.state_manager.sessions_relabelled.connect(self.on_data_updated)
         self.state_manager.session_selected.connect(self.on_session_selected)
+        self.state_manager.range_selected.connect(self.on_range_selected)
 
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -101,23 +103,31 @@ class SessionReportWidget(QWidget):
         """Called by parent Manager when toggle changes"""
         if self.stack_pbs != enabled:
             self.stack_pbs = enabled
-            if self.current_session_id is not None:
-                self.on_session_selected(self.current_session_id)
+            self.reload()
 
     def on_data_updated(self, df): 
         self.full_df = df
-        if self.current_session_id is not None:
-            self.on_session_selected(self.current_session_id)
+        self.reload()
+
+    def reload(self):
+        if self.current_range is not None: self.on_range_selected(*self.current_range)
+        elif self.current_session_id is not None: self.on_session_selected(self.current_session_id)
+
+    def on_range_selected(self, start, end):
+        self.current_range = (start, end)
+        if self.full_df is None: return
+        self.summary = self.state_manager.session_summaries.range_report(self.state_manager.history, start, end, self.stack_pbs)
+        if not self.summary: return
+        self.refresh_view()
 
     def on_session_selected(self, session_id):
         self.current_session_id = session_id 
+        self.current_range = None
         if self.full_df is None: return
-        if session_id not in self.full_df['SessionID'].values: return
-
-        session_df = self.full_df[self.full_df['SessionID'] == session_id].copy()
-        session_df.sort_values('Timestamp', inplace=True)
+        session_df = self.state_manager.history.session(session_id).copy()
+        if session_df.empty: return
         
-        self.summary = engine.analyze_session(session_df, self.full_df, stack_pbs=self.stack_pbs)
+        self.summary = self.state_manager.session_summaries.summarize(session_df, self.state_manager.history, self.stack_pbs)
         if not self.summary: return
         
         self.refresh_view()
@@ -136,7 +146,8 @@ class SessionReportWidget(QWidget):
         self.refresh_metrics(meta, data['pb_count'])
         
         # 2. Plot
-        raw_points = data['graph_data']
+        # Copies: the summary is shared with the cache, points and lists get decorated / sorted here
+        raw_points = [dict(p) for p in data['graph_data']]
         unique_scens = sorted(list(set(p['scenario'] for p in raw_points)))
         color_map = {scen: COLORS_CYCLE_10[i % len(COLORS_CYCLE_10)] for i, scen in enumerate(unique_scens)}
         
@@ -204,7 +215,7 @@ class SessionReportWidget(QWidget):
         self.chart.plot_payload(payload)
         
         # 3. Lists
-        self.render_lists(data['lists'])
+        self.render_lists({name: list(items) for name, items in data['lists'].items()})
 
     def refresh_metrics(self, meta, pb_count):
         while self.header_layout.count(): 
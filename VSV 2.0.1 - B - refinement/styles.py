@@ -62,7 +62,7 @@ QPushButton:hover {{
     border: 1px solid {ACCENT};
     color: white;
 }}
-QTableWidget {{
+QTableWidget, QTableView {{
     background-color: {BG_DARK};
     gridline-color: {BORDER};
     border: none;
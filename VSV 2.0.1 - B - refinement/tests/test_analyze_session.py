@@ -0,0 +1,88 @@
+import json
+import math
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from core.analytics import stats
+from core.history_store import HistoryStore
+
+# Output of the row-loop analyze_session (before the vectorized rewrite) on make_history(),
+# keyed by "<session id>-<stack_pbs>". Regenerate only when the report format changes on purpose.
+GOLDEN_PATH = Path(__file__).parent / 'fixtures' / 'analyze_session_golden.json'
+# Session 0: no prior history. Session 4: one combo sets a new PB on every run.
+CASES = [(sid, stack) for sid in (0, 2, 4) for stack in (False, True)]
+
+def make_history():
+    """Deterministic history: 5 sessions over 3 scenarios x 2 sens, with ties and a PB streak"""
+    rows = []
+    t = pd.Timestamp('2024-03-01 18:00')
+    for sid in range(5):
+        for i in range(24):
+            scen, sens = "ABC"[i % 3], (30.0, 40.0)[(i // 3) % 2]
+            score = 500.0 + (i * 37 + sid * 11) % 101 + 4 * sid
+            if i % 7 == 0: score = 550.0 # ties across runs and sessions
+            if sid == 4 and scen == 'A' and sens == 30.0: score = 700.0 + 10 * i # PB on every run
+            rows.append({'Timestamp': t, 'Scenario': scen, 'Sens': sens, 'Score': score,
+                         'Duration': 60.0, 'SessionID': sid})
+            t += pd.Timedelta(seconds=75 + (i % 4) * 20)
+        t += pd.Timedelta(hours=20)
+    return pd.DataFrame(rows)
+
+def normalize(obj):
+    """JSON-comparable form: Timestamps as ISO strings, numpy scalars as Python numbers"""
+    if isinstance(obj, dict): return {str(k): normalize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)): return [normalize(v) for v in obj]
+    if isinstance(obj, pd.Timestamp): return obj.isoformat()
+    if isinstance(obj, np.bool_): return bool(obj)
+    if isinstance(obj, np.integer): return int(obj)
+    if isinstance(obj, np.floating): return float(obj)
+    return obj
+
+def assert_matches(actual, expected, path='report'):
+    if isinstance(expected, dict):
+        # Keys added after the golden was recorded (e.g. "totals") are not part of the regression
+        for key, value in expected.items():
+            assert key in actual, f"{path}: missing {key}"
+            assert_matches(actual[key], value, f"{path}/{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), f"{path}: {len(actual)} items, expected {len(expected)}"
+        for i, (a, e) in enumerate(zip(actual, expected)): assert_matches(a, e, f"{path}[{i}]")
+    elif isinstance(expected, float) and not isinstance(actual, bool):
+        assert isinstance(actual, (int, float)), f"{path}: {actual!r}"
+        assert (math.isnan(actual) and math.isnan(expected)) or math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-7), \
+            f"{path}: {actual} != {expected}"
+    else:
+        assert actual == expected, f"{path}: {actual!r} != {expected!r}"
+
+@pytest.fixture(scope='module')
+def history_df(): return make_history()
+
+@pytest.fixture(scope='module')
+def golden():
+    with open(GOLDEN_PATH) as f: return json.load(f)
+
+@pytest.mark.parametrize('use_store', [False, True])
+@pytest.mark.parametrize('session_id, stack_pbs', CASES)
+def test_matches_row_loop_output(history_df, golden, session_id, stack_pbs, use_store):
+    session = history_df[history_df['SessionID'] == session_id].copy()
+    store = HistoryStore(history_df) if use_store else None
+    report = stats.analyze_session(session, history_df, stack_pbs=stack_pbs, history=store)
+    assert_matches(normalize(report), golden[f"{session_id}-{stack_pbs}"])
+
+def test_no_prior_history_has_no_pbs(history_df):
+    # Nothing to beat yet: first runs are not reported as PBs
+    session = history_df[history_df['SessionID'] == 0].copy()
+    for stack_pbs in (False, True):
+        report = stats.analyze_session(session, history_df, stack_pbs=stack_pbs)
+        assert report['grid']['pb_count'] == 0 and report['grid']['lists']['pbs'] == []
+
+def test_repeated_pbs_on_one_combo(history_df):
+    session = history_df[history_df['SessionID'] == 4].copy()
+    runs = session[(session['Scenario'] == 'A') & (session['Sens'] == 30.0)]['Score'].tolist()
+    def streak(stack_pbs):
+        pbs = stats.analyze_session(session, history_df, stack_pbs=stack_pbs)['grid']['lists']['pbs']
+        return [p['score'] for p in pbs if p['name'] == 'A' and p['sens'] == 30.0]
+    # Best of the session only vs every run that beat the one before it
+    assert streak(False) == [max(runs)]
+    assert sorted(streak(True)) == runs
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.analytics import processors
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Empty in-memory rank state and a temp cache dir for the persisted one"""
+    monkeypatch.setattr(processors, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(processors, '_ENRICH_STATE', None)
+
+def make_runs(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.choice(10**7, n, replace=False)), 's'),
+        'Scenario': rng.choice(['Pasu', 'Pasu Small', 'VT Bounce'], n),
+        'Sens': rng.choice([30.0, 35.5], n),
+        'Score': rng.integers(90, 110, n).astype(float), # narrow range: many ties and repeated PBs
+        'Duration': 60.0,
+    })
+
+def reference_ranks(df):
+    """Row by row with plain lists: prior scores of the combo / scenario"""
+    combo_scores, scen_max, rows = {}, {}, []
+    for scen, sens, score in zip(df['Scenario'], df['Sens'], df['Score']):
+        prior = combo_scores.setdefault((scen, sens), [])
+        below = sum(s < score for s in prior)
+        rows.append({
+            'Is_PB': int(not prior or score > max(prior)), 'Is_First': int(not prior),
+            'Is_Scen_PB': int(scen not in scen_max or score > scen_max[scen]),
+            'Pct': 100.0 if not prior or score >= max(prior) else below / len(prior) * 100,
+            'Run_Num': len(prior) + 1,
+        })
+        prior.append(score)
+        scen_max[scen] = max(score, scen_max.get(scen, score))
+    out = pd.DataFrame(rows)
+    for name, threshold, gated in processors.DEFAULT_RANK_TIERS:
+        hit = out['Pct'] >= threshold
+        if gated: hit &= out['Run_Num'] >= processors.RANK_GATE_RUNS
+        out[f'Rank_{name}'] = hit.astype(int)
+    return out
+
+def check(enriched, ref):
+    for col in ref.columns:
+        np.testing.assert_allclose(enriched[col].to_numpy(dtype=float), ref[col].to_numpy(dtype=float), rtol=1e-6, err_msg=col)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_full_pass_matches_reference(seed):
+    df = make_runs(600, seed)
+    check(processors.enrich_history_with_stats(df.copy()), reference_ranks(df))
+
+@pytest.mark.parametrize('seed', range(3))
+def test_incremental_pass_matches_full_pass(seed):
+    df = make_runs(600, seed)
+    full = processors.enrich_history_with_stats(df.copy())
+    processors._ENRICH_STATE = None
+    # Vectorized pass on a prefix, then the per-run path for each batch of appended runs
+    for end in (200, 201, 350, 600):
+        grown = processors.enrich_history_with_stats(df.iloc[:end].copy())
+    pd.testing.assert_frame_equal(grown, full)
+    check(grown, reference_ranks(df))
+
+def test_rank_all_and_rank_runs_agree():
+    df = make_runs(400, 11)
+    scores = df['Score'].to_numpy(dtype=np.float64)
+    cols_all, state_all = processors._rank_all(df, scores)
+    state = processors.EnrichState()
+    cols = processors._empty_enrich_columns(len(df))
+    processors._rank_runs(state, df['Scenario'].tolist(), df['Sens'].tolist(), scores.tolist(), cols, 0)
+    for col in processors.ENRICH_COLUMNS: np.testing.assert_array_equal(cols[col], cols_all[col], err_msg=col)
+    assert {k: v.tolist() for k, v in state.combo_scores.items()} == {k: v.tolist() for k, v in state_all.combo_scores.items()}
+    assert state.scen_max == state_all.scen_max
+
+def test_persisted_state_survives_restarts():
+    df = make_runs(2000, 5)
+    full = processors.enrich_history_with_stats(df.copy())
+    # Each restart reloads full state + tail from disk, then ranks the appended runs
+    for end in (1500, 1510, 1600, 1700, 2000):
+        processors._ENRICH_STATE = None
+        grown = processors.enrich_history_with_stats(df.iloc[:end].copy(), persist=True)
+    pd.testing.assert_frame_equal(grown, full)
@@ -0,0 +1,43 @@
+import bisect
+import numpy as np
+import pytest
+from core.analytics.order_stats import SortedScores, running_quantile
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Tiny blocks so a few hundred values exercise block splits and the Fenwick index
+    monkeypatch.setattr(SortedScores, 'BLOCK_SIZE', 4)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_add_rank_percentile_match_bisect(small_blocks, seed):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 40, 300).astype(float).tolist() # lots of ties
+    scores, reference = SortedScores(), []
+    for v in values:
+        expected_pct = 100 if not reference or v >= reference[-1] else bisect.bisect_left(reference, v) / len(reference) * 100
+        assert scores.percentile(v) == expected_pct
+        scores.add(v)
+        bisect.insort(reference, v)
+        assert len(scores) == len(reference) and scores.max() == reference[-1]
+        for probe in (v, v - 0.5, v + 0.5, -1.0, 99.0):
+            assert scores.rank(probe) == bisect.bisect_left(reference, probe)
+    assert scores.tolist() == reference == list(scores)
+
+def test_constructors_match_incremental_adds(small_blocks):
+    values = np.random.default_rng(7).integers(0, 10, 100).astype(float).tolist()
+    built, from_sorted = SortedScores(values), SortedScores.from_sorted(sorted(values))
+    for s in (built, from_sorted):
+        assert s.tolist() == sorted(values)
+        assert [s.rank(p) for p in range(-1, 12)] == [bisect.bisect_left(sorted(values), p) for p in range(-1, 12)]
+        s.add(4.0)
+        assert s.tolist() == sorted(values + [4.0])
+
+def test_empty():
+    s = SortedScores()
+    assert len(s) == 0 and s.max() is None and s.rank(5) == 0 and s.percentile(5) == 100
+
+@pytest.mark.parametrize('q', [0.0, 0.25, 0.5, 0.75, 0.9, 1.0])
+def test_running_quantile_matches_numpy(q):
+    values = np.random.default_rng(3).integers(0, 25, 200).astype(float)
+    expected = [np.quantile(values[:i + 1], q) for i in range(len(values))]
+    np.testing.assert_allclose(running_quantile(values.tolist(), q), expected, rtol=0, atol=1e-9)
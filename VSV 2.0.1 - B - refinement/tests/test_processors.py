@@ -0,0 +1,76 @@
+import os
+import time
+import pytest
+from core.analytics import processors
+
+RUN_SUMMARY = """Kill #,Timestamp,Bot,Weapon,TTK,Shots,Hits,Accuracy,Damage Done,Damage Possible,Efficiency,Cheated,OverShots
+1,12:00:01.123,Bot,Gun,0.5s,1,1,1.0,100,100,1.0,false,0
+
+Weapon,Shots,Hits
+Gun,1,1
+
+Kills:,50
+Deaths:,0
+Fight Time:,60.0
+Score:,{score}
+Scenario:,{scenario}
+Hash:,abc
+Challenge Start:,{start}
+Sens Scale:,cm/360
+Horiz Sens:,40.0
+Vert Sens:,40.0
+FOV:,103
+"""
+
+def write_run(folder, scenario, stamp, score, start, partial=False, age=0):
+    path = folder / f"{scenario} - Challenge - {stamp} Stats.csv"
+    text = RUN_SUMMARY.format(score=score, scenario=scenario, start=start)
+    # A run still being written: KovaaK's writes the kill log before the summary
+    path.write_text(text.split('\n\n')[0] if partial else text)
+    if age: os.utime(path, (time.time() - age, time.time() - age))
+    return path
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Points the history cache at a temp dir and forgets files known from other tests"""
+    monkeypatch.setattr(processors, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(processors, 'CACHE_HISTORY_PATH', tmp_path / 'legacy.pkl')
+    monkeypatch.setattr(processors, 'CACHE_INFO_PATH', tmp_path / 'legacy.json')
+    monkeypatch.setattr(processors, '_KNOWN_FILES', {})
+    stats = tmp_path / 'stats'
+    stats.mkdir()
+    return stats
+
+def test_run_still_being_written_is_retried_by_the_next_load(cache):
+    write_run(cache, 'Pasu', '2024.05.01-18.00.00', 900.5, '17:59:00.0000000')
+    pending = write_run(cache, 'Pasu', '2024.05.01-18.02.00', 950.0, '18:01:00.0000000', partial=True)
+
+    df = processors.find_and_process_stats(cache)
+    assert df['Score'].tolist() == [900.5]
+    assert str(pending) not in processors._KNOWN_FILES
+
+    # Finished in place: the folder mtime may not move, the file is past the watermark
+    write_run(cache, 'Pasu', '2024.05.01-18.02.00', 950.0, '18:01:00.0000000')
+    df = processors.find_and_process_stats(cache)
+    assert df['Score'].tolist() == [900.5, 950.0]
+
+def test_old_unparseable_file_is_not_retried(cache):
+    write_run(cache, 'Pasu', '2024.05.01-18.00.00', 900.5, '17:59:00.0000000')
+    broken = write_run(cache, 'Pasu', '2024.04.01-18.00.00', 0, '17:59:00.0000000', partial=True,
+                       age=processors.PENDING_WRITE_SECONDS * 10)
+
+    processors.find_and_process_stats(cache)
+    # Recorded as known so every later scan skips it without parsing
+    assert str(broken) in processors._KNOWN_FILES
+    assert processors.storage.read_scan_state(processors.CACHE_DIR)['dir_mtime'] is not None
+
+def test_live_ingest_retries_run_still_being_written(cache):
+    write_run(cache, 'Pasu', '2024.05.01-18.00.00', 900.5, '17:59:00.0000000')
+    history = processors.find_and_process_stats(cache)
+
+    write_run(cache, 'Pasu', '2024.05.01-18.02.00', 950.0, '18:01:00.0000000', partial=True)
+    assert processors.ingest_new_runs(cache, history) is None
+
+    write_run(cache, 'Pasu', '2024.05.01-18.02.00', 950.0, '18:01:00.0000000')
+    grown = processors.ingest_new_runs(cache, history)
+    assert grown['Score'].tolist() == [900.5, 950.0]
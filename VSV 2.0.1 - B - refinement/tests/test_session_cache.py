@@ -0,0 +1,22 @@
+from core.analytics.session_cache import SessionSummaryCache
+
+def test_grown_session_replaces_its_old_fingerprint(tmp_path):
+    cache = SessionSummaryCache(tmp_path / 'summaries.pkl')
+    # (stack, start, runs, prior rows, score sum): the live session gains a run
+    cache.put((False, 100, 5, 40, 4500.0), 'five runs')
+    cache.put((True, 100, 5, 40, 4500.0), 'stacked')
+    cache.put((False, 50, 9, 31, 8100.0), 'older session')
+    cache.put((False, 100, 6, 40, 5400.0), 'six runs')
+
+    assert cache.get((False, 100, 5, 40, 4500.0)) is None
+    assert cache.get((False, 100, 6, 40, 5400.0)) == 'six runs'
+    assert cache.get((True, 100, 5, 40, 4500.0)) == 'stacked'
+    assert cache.get((False, 50, 9, 31, 8100.0)) == 'older session'
+
+def test_saved_only_when_asked(tmp_path):
+    path = tmp_path / 'summaries.pkl'
+    cache = SessionSummaryCache(path)
+    cache.put((False, 100, 5, 40, 4500.0), 'five runs')
+    assert not path.exists()
+    cache.save()
+    assert SessionSummaryCache(path).get((False, 100, 5, 40, 4500.0)) == 'five runs'